@@ -1,53 +1,178 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import pickle
 import pandas as pd
 from datetime import datetime
 
-from backtester.strategies.moving_average import MovingAverageCrossover
+from backtester.strategies.base_strategy import BaseStrategy
 from backtester.engine.portfolio import Portfolio
+from backtester.engine.risk import RiskManager
+
+CHECKPOINT_VERSION = 1
 
 class Backtest:
-    def __init__(self, data: pd.DataFrame, strategy: MovingAverageCrossover,
-                 initial_cash: float = 100000.0, commission: float = 0.001):
+    def __init__(self, data: pd.DataFrame, strategy: BaseStrategy,
+                 initial_cash: float = 100000.0, commission: float = 0.001,
+                 risk_manager: Optional[RiskManager] = None):
         """
         Initialize the backtest with data, strategy, and portfolio parameters.
         
         Args:
             data (pd.DataFrame): Historical OHLCV data
-            strategy (MovingAverageCrossover): Trading strategy
+            strategy (BaseStrategy): Trading strategy
             initial_cash (float): Initial portfolio cash
             commission (float): Commission rate per trade
+            risk_manager (Optional[RiskManager]): Risk manager updated every bar and used
+                to size buys; sells then close the position (default: size trades with
+                the strategy's calculate_position_size)
         """
         self.data = data
         self.strategy = strategy
         self.portfolio = Portfolio(initial_cash=initial_cash, commission=commission)
+        self.risk_manager = risk_manager
         self.results = None
-        
-    def run(self) -> Dict[str, Any]:
+        self.history_tail: Optional[pd.DataFrame] = None  # Warm-up bars kept for resuming
+        self.data_offset: Optional[int] = None  # Bytes of the source file already processed
+    
+    def run(self, signals: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """
         Run the backtest simulation.
         
+        Args:
+            signals (Optional[pd.DataFrame]): Signals already generated by the strategy
+                for the data, with 'Close' and 'Position' columns (default: generate them)
+        
         Returns:
             Dict[str, Any]: Backtest results including equity curve and trade history
         """
+        # Keep the raw bars needed to warm up the strategy's indicators on resume,
+        # before the strategy adds its columns to the data
+        self.history_tail = self._tail(self.data)
+        
         # Generate trading signals
-        signals = self.strategy.generate_signals(self.data)
+        if signals is None:
+            signals = self.strategy.generate_signals(self.data)
+        
+        self._simulate(signals)
+        return self._collect_results()
+    
+    def resume(self, new_data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Continue a finished or restored backtest with newly appended bars.
+        
+        Signals are regenerated only for the warm-up bars and the new bars, so the
+        cost grows with the number of new bars rather than the length of the history.
+        The results match re-running the backtest on the full history, up to
+        floating-point rounding in the recomputed rolling windows.
+        
+        Args:
+            new_data (pd.DataFrame): OHLCV bars after the last processed bar
+        
+        Returns:
+            Dict[str, Any]: Backtest results over the full history
+        """
+        if self.history_tail is None:
+            raise ValueError("Backtest has not been run yet, or its strategy does not support resuming")
+        
+        if not self.history_tail.empty:
+            new_data = new_data[new_data.index > self.history_tail.index[-1]]
+        if new_data.empty:
+            return self._collect_results()
+        
+        data = pd.concat([self.history_tail, new_data[self.history_tail.columns]])
+        warmup = len(self.history_tail)
+        self.history_tail = self._tail(data)
+        
+        signals = self.strategy.generate_signals(data)
+        self._simulate(signals.iloc[warmup:])
+        return self._collect_results()
+    
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Capture the state needed to resume the backtest.
+        
+        Returns:
+            Dict[str, Any]: Strategy, portfolio state and warm-up bars
+        """
+        if self.history_tail is None:
+            raise ValueError("Backtest has not been run yet, or its strategy does not support resuming")
+        return {
+            'version': CHECKPOINT_VERSION,
+            'strategy': self.strategy,
+            'portfolio': self.portfolio.checkpoint(),
+            'history_tail': self.history_tail,
+            'data_offset': self.data_offset,
+            'risk_manager': self.risk_manager
+        }
+    
+    def save_checkpoint(self, path: str, data_offset: Optional[int] = None) -> None:
+        """
+        Save a checkpoint of the backtest to a file.
+        
+        Args:
+            path (str): Path of the checkpoint file
+            data_offset (Optional[int]): Bytes of the source file processed so far,
+                as returned by DataLoader.load_appended
+        """
+        if data_offset is not None:
+            self.data_offset = data_offset
+        with open(path, 'wb') as f:
+            pickle.dump(self.checkpoint(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def load_checkpoint(cls, path: str) -> 'Backtest':
+        """
+        Restore a backtest from a checkpoint file.
         
+        Args:
+            path (str): Path of the checkpoint file
+        
+        Returns:
+            Backtest: Backtest ready to resume with new bars
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        
+        portfolio = Portfolio.from_checkpoint(state['portfolio'])
+        backtest = cls(data=state['history_tail'], strategy=state['strategy'],
+                       initial_cash=portfolio.initial_cash, commission=portfolio.commission,
+                       risk_manager=state.get('risk_manager'))
+        backtest.portfolio = portfolio
+        backtest.history_tail = state['history_tail']
+        backtest.data_offset = state['data_offset']
+        return backtest
+    
+    def get_results(self) -> Dict[str, Any]:
+        """
+        Get the backtest results.
+        
+        Returns:
+            Dict[str, Any]: Backtest results
+        """
+        if self.results is None:
+            raise ValueError("Backtest has not been run yet")
+        return self.results
+    
+    def _simulate(self, signals: pd.DataFrame) -> None:
+        """Update equity and execute trades for each bar of the signals."""
         # Iterate through each day
         for timestamp, row in signals.iterrows():
             if pd.isna(row['Position']):
                 continue
-                
+            
             # Update portfolio equity
             current_prices = {'symbol': row['Close']}  # Assuming single symbol for now
             self.portfolio.update_equity(timestamp, current_prices)
+            if self.risk_manager is not None:
+                self.risk_manager.update(current_prices)
             
             # Execute trades based on signals
             if row['Position'] != 0:
                 trade_type = 'BUY' if row['Position'] > 0 else 'SELL'
-                quantity = self.strategy.calculate_position_size(
-                    row['Close'],
-                    self.portfolio.cash
-                )
+                quantity = self._position_size(trade_type, row['Close'])
+                if quantity <= 0:
+                    continue
                 
                 try:
                     self.portfolio.execute_trade(
@@ -59,8 +184,25 @@ class Backtest:
                     )
                 except ValueError as e:
                     print(f"Trade execution failed: {e}")
+    
+    def _position_size(self, trade_type: str, price: float) -> float:
+        """Number of shares to trade on a signal."""
+        if self.risk_manager is None:
+            return self.strategy.calculate_position_size(price, self.portfolio.cash)
         
-        # Get final results
+        held = self.portfolio.positions.get('symbol', 0.0)
+        if trade_type == 'SELL':
+            return held
+        
+        equity = self.portfolio.equity_history[-1]['total_equity']
+        target = self.risk_manager.position_size('symbol', float(price), equity)
+        # At the leverage cap the target uses all of equity; keep room for the commission
+        # (and a little for rounding) so the buy is not rejected for lack of cash
+        affordable = self.portfolio.cash / (price * (1 + self.portfolio.commission)) * (1 - 1e-9)
+        return min(target - held, affordable)
+    
+    def _collect_results(self) -> Dict[str, Any]:
+        """Build the results from the portfolio ledger."""
         equity_curve = self.portfolio.get_equity_curve()
         trade_history = self.portfolio.get_trade_history()
         
@@ -73,13 +215,9 @@ class Backtest:
         
         return self.results
     
-    def get_results(self) -> Dict[str, Any]:
-        """
-        Get the backtest results.
-        
-        Returns:
-            Dict[str, Any]: Backtest results
-        """
-        if self.results is None:
-            raise ValueError("Backtest has not been run yet")
-        return self.results 
\ No newline at end of file
+    def _tail(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Copy the raw bars the strategy needs to warm up on resume (None if it cannot resume)."""
+        warmup = self.strategy.get_warmup_period()
+        if warmup is None:
+            return None
+        return data.iloc[-warmup:].copy()
\ No newline at end of file
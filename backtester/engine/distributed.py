@@ -0,0 +1,408 @@
+import hashlib
+import ipaddress
+import json
+import multiprocessing
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from backtester.engine.optimizer import expand_parameter_grid
+from backtester.engine.universe import run_symbol_backtest
+from backtester.strategies import get_strategy_class
+
+@dataclass
+class SweepJob:
+    """
+    One backtest of a sweep: a strategy with its parameters on one symbol.
+    """
+    strategy: str
+    parameters: Dict[str, Any]
+    symbol: str
+    initial_cash: float = 100000.0
+    commission: float = 0.001
+
+    @property
+    def job_id(self) -> str:
+        """Stable identifier, so the same backtest is only ever run once per sweep."""
+        key = json.dumps([self.strategy, self.parameters, self.symbol,
+                          self.initial_cash, self.commission], sort_keys=True, default=str)
+        return hashlib.sha1(key.encode()).hexdigest()
+
+
+@dataclass
+class _Lease:
+    """A job handed to a worker, valid until its deadline."""
+    worker_id: str
+    deadline: float
+
+
+def make_sweep_jobs(strategy: str, param_grid: Dict[str, List[Any]], symbols: List[str],
+                    initial_cash: float = 100000.0, commission: float = 0.001) -> List[SweepJob]:
+    """
+    Build the jobs of a parameter and universe sweep.
+
+    Args:
+        strategy (str): Strategy name, e.g. 'RSIStrategy'
+        param_grid (Dict[str, List[Any]]): Candidate values for each parameter
+        symbols (List[str]): Symbols to run every parameter set on
+        initial_cash (float): Initial portfolio cash per job
+        commission (float): Commission rate per trade
+
+    Returns:
+        List[SweepJob]: One job per valid parameter set and symbol
+    """
+    candidates = expand_parameter_grid(get_strategy_class(strategy), param_grid)
+    return [
+        SweepJob(strategy, parameters, symbol, initial_cash, commission)
+        for parameters in candidates
+        for symbol in symbols
+    ]
+
+
+def _is_loopback(host: str) -> bool:
+    """Check whether a host name or address only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class SweepCoordinator:
+    def __init__(self, jobs: List[SweepJob], address: Tuple[str, int] = ('localhost', 0),
+                 authkey: Optional[bytes] = None, batch_size: int = 8,
+                 lease_timeout: float = 30.0, max_retries: int = 3):
+        """
+        Initialize a coordinator that hands sweep jobs to workers over a socket.
+
+        Workers pull batches of jobs and must send heartbeats while they work.
+        A batch whose worker stops sending heartbeats is put back in the queue
+        after lease_timeout seconds. A job that fails more than max_retries times
+        is recorded as failed. Jobs are deduplicated by job_id, and a job that
+        is reported twice is only counted once.
+
+        Connections exchange pickled messages, so anyone holding the authkey
+        can run code on the coordinator and the workers. Keep the key secret.
+
+        Args:
+            jobs (List[SweepJob]): Jobs of the sweep
+            address (Tuple[str, int]): Host and port to listen on (port 0 picks a free port)
+            authkey (Optional[bytes]): Secret key workers must present; required unless
+                the address is a loopback address (default: a random key)
+            batch_size (int): Maximum number of jobs per batch
+            lease_timeout (float): Seconds without a heartbeat before a batch is reassigned
+            max_retries (int): Number of times a failed or lost job is retried
+        """
+        self.jobs: Dict[str, SweepJob] = {}
+        for job in jobs:
+            self.jobs.setdefault(job.job_id, job)
+
+        if authkey is None:
+            if not _is_loopback(address[0]):
+                raise ValueError("An authkey is required to listen on a non-loopback address")
+            authkey = secrets.token_bytes(32)
+
+        self.authkey = authkey
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout
+        self.max_retries = max_retries
+
+        self.pending: Deque[str] = deque(self.jobs)
+        self.leases: Dict[str, _Lease] = {}  # job_id -> lease of a running job
+        self.attempts: Dict[str, int] = {}  # job_id -> number of failed or lost attempts
+        self.finished: Dict[str, Dict[str, Any]] = {}  # job_id -> metrics row
+        self.failures: Dict[str, str] = {}  # job_id -> last error
+
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._listener = Listener(address, authkey=authkey)
+        self.address: Tuple[str, int] = self._listener.address
+
+    def serve(self, timeout: Optional[float] = None) -> pd.DataFrame:
+        """
+        Serve jobs until every job has finished or failed.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to serve (default: no limit)
+
+        Returns:
+            pd.DataFrame: One row of metrics per finished job, indexed by job_id
+        """
+        accept_thread = threading.Thread(target=self._accept, daemon=True)
+        accept_thread.start()
+
+        started = time.monotonic()
+        try:
+            while not self._check_done():
+                if timeout is not None and time.monotonic() - started > timeout:
+                    raise TimeoutError(f"Sweep did not finish within {timeout} seconds")
+                self._expire_leases()
+                time.sleep(min(0.2, self.lease_timeout / 4))
+        finally:
+            self._done.set()
+            self._listener.close()
+
+        return self.get_results()
+
+    def get_results(self) -> pd.DataFrame:
+        """
+        Get the merged metrics table of the finished jobs.
+
+        Returns:
+            pd.DataFrame: One row of metrics per finished job, indexed by job_id
+        """
+        with self._lock:
+            rows = [{'job_id': job_id, **row} for job_id, row in self.finished.items()]
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).set_index('job_id')
+
+    def _check_done(self) -> bool:
+        """Check whether every job has finished or failed."""
+        with self._lock:
+            return len(self.finished) + len(self.failures) == len(self.jobs)
+
+    def _expire_leases(self) -> None:
+        """Put the jobs of workers that stopped sending heartbeats back in the queue."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, lease in self.leases.items() if lease.deadline < now]
+            for job_id in expired:
+                lease = self.leases.pop(job_id)
+                self._retry(job_id, f"Lease expired on worker {lease.worker_id}")
+
+    def _retry(self, job_id: str, error: str) -> None:
+        """Requeue a job, or record it as failed once it is out of retries. Caller holds the lock."""
+        if job_id in self.finished:
+            return
+        self.attempts[job_id] = self.attempts.get(job_id, 0) + 1
+        if self.attempts[job_id] > self.max_retries:
+            self.failures[job_id] = error
+        else:
+            self.pending.append(job_id)
+
+    def _accept(self) -> None:
+        """Accept worker connections until the sweep is done."""
+        while not self._done.is_set():
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                # Closed listener, or a client that failed authentication
+                if self._done.is_set():
+                    return
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: Connection) -> None:
+        """Answer the requests of one worker connection."""
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(self._dispatch(message))
+                except (EOFError, OSError):
+                    return
+
+    def _dispatch(self, message: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """Apply one worker request to the queue state and build the reply."""
+        kind, worker_id = message[0], message[1]
+        now = time.monotonic()
+
+        with self._lock:
+            if kind == 'get':
+                if len(self.finished) + len(self.failures) == len(self.jobs):
+                    return ('done',)
+                batch = []
+                while self.pending and len(batch) < self.batch_size:
+                    job_id = self.pending.popleft()
+                    if job_id in self.finished or job_id in self.failures:
+                        continue
+                    self.leases[job_id] = _Lease(worker_id, now + self.lease_timeout)
+                    batch.append(self.jobs[job_id])
+                if not batch:
+                    return ('wait', min(1.0, self.lease_timeout / 4))
+                return ('jobs', batch)
+
+            if kind == 'heartbeat':
+                for lease in self.leases.values():
+                    if lease.worker_id == worker_id:
+                        lease.deadline = now + self.lease_timeout
+                return ('ok',)
+
+            if kind == 'result':
+                job_id, row = message[2], message[3]
+                lease = self.leases.get(job_id)
+                if lease is not None and lease.worker_id == worker_id:
+                    del self.leases[job_id]
+                # A job that was reassigned after a lost lease may be reported twice
+                if job_id not in self.finished:
+                    self.failures.pop(job_id, None)
+                    self.finished[job_id] = row
+                return ('ok',)
+
+            if kind == 'error':
+                job_id, error = message[2], message[3]
+                lease = self.leases.get(job_id)
+                if lease is not None and lease.worker_id == worker_id:
+                    del self.leases[job_id]
+                    self._retry(job_id, error)
+                return ('ok',)
+
+        return ('error', f"Unknown request: {kind}")
+
+
+class SweepWorker:
+    def __init__(self, address: Tuple[str, int], data_dir: Union[str, Path],
+                 authkey: bytes, worker_id: Optional[str] = None,
+                 heartbeat_interval: float = 5.0):
+        """
+        Initialize a worker that pulls sweep jobs from a coordinator.
+
+        Args:
+            address (Tuple[str, int]): Host and port of the coordinator
+            data_dir (Union[str, Path]): Path to the worker's data directory
+            authkey (bytes): Secret key of the coordinator
+            worker_id (Optional[str]): Worker name (default: host name and process id)
+            heartbeat_interval (float): Seconds between heartbeats, well below the lease timeout
+        """
+        self.address = address
+        self.data_dir = data_dir
+        self.authkey = authkey
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.completed = 0
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self) -> int:
+        """
+        Process batches until the coordinator reports the sweep is done.
+
+        Returns:
+            int: Number of jobs this worker completed
+        """
+        self._conn = Client(self.address, authkey=self.authkey)
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+
+        try:
+            while True:
+                reply = self._request(('get', self.worker_id))
+                if reply[0] == 'done':
+                    break
+                if reply[0] == 'wait':
+                    time.sleep(reply[1])
+                    continue
+                for job in reply[1]:
+                    self._run_job(job)
+        except (EOFError, OSError):
+            # The coordinator closes its listener once the sweep is complete
+            pass
+        finally:
+            self._stop.set()
+            self._conn.close()
+
+        return self.completed
+
+    def _run_job(self, job: SweepJob) -> None:
+        """Run one job and report its metrics or its error."""
+        try:
+            row = run_symbol_backtest(self.data_dir, f"{job.symbol}.csv",
+                                      get_strategy_class(job.strategy), job.parameters,
+                                      job.initial_cash, job.commission)
+        except Exception as e:
+            self._request(('error', self.worker_id, job.job_id, str(e)))
+            return
+
+        row = {'strategy': job.strategy, **job.parameters, **row, 'worker': self.worker_id}
+        self._request(('result', self.worker_id, job.job_id, row))
+        self.completed += 1
+
+    def _request(self, message: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """Send a request and wait for its reply."""
+        with self._lock:
+            self._conn.send(message)
+            return self._conn.recv()
+
+    def _heartbeat(self) -> None:
+        """Keep this worker's leases alive while it runs long jobs."""
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self._request(('heartbeat', self.worker_id))
+            except (EOFError, OSError):
+                return
+
+
+def run_worker(address: Tuple[str, int], data_dir: Union[str, Path],
+               authkey: bytes, heartbeat_interval: float = 5.0) -> int:
+    """
+    Run a sweep worker until the coordinator is done.
+
+    Args:
+        address (Tuple[str, int]): Host and port of the coordinator
+        data_dir (Union[str, Path]): Path to the worker's data directory
+        authkey (bytes): Secret key of the coordinator
+        heartbeat_interval (float): Seconds between heartbeats
+
+    Returns:
+        int: Number of jobs this worker completed
+    """
+    worker = SweepWorker(address, data_dir, authkey=authkey, heartbeat_interval=heartbeat_interval)
+    return worker.run()
+
+
+def run_local_sweep(jobs: List[SweepJob], data_dir: Union[str, Path], n_workers: int = 2,
+                    timeout: Optional[float] = None, **coordinator_options) -> SweepCoordinator:
+    """
+    Run a sweep end to end with a coordinator and worker processes on this machine.
+
+    This stands in for a cluster: the workers use the same socket protocol
+    as workers started with run_worker on other hosts. The coordinator
+    listens on localhost with a freshly generated key unless told otherwise.
+
+    Args:
+        jobs (List[SweepJob]): Jobs of the sweep
+        data_dir (Union[str, Path]): Path to the data directory
+        n_workers (int): Number of worker processes
+        timeout (Optional[float]): Maximum number of seconds to serve (default: no limit)
+        **coordinator_options: Extra options passed to SweepCoordinator
+
+    Returns:
+        SweepCoordinator: The finished coordinator, with results and failures
+    """
+    coordinator_options.setdefault('authkey', secrets.token_bytes(32))
+    coordinator = SweepCoordinator(jobs, **coordinator_options)
+    heartbeat_interval = coordinator.lease_timeout / 4
+
+    workers = [
+        multiprocessing.Process(target=run_worker,
+                                args=(coordinator.address, data_dir, coordinator.authkey,
+                                      heartbeat_interval))
+        for _ in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        coordinator.serve(timeout=timeout)
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    return coordinator
@@ -0,0 +1,239 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.engine.backtest import Backtest
+from backtester.strategies.base_strategy import BaseStrategy
+
+StrategySpec = Union[BaseStrategy, Tuple[Type[BaseStrategy], Dict[str, Any]]]
+
+COMBINE_METHODS = ['vote', 'weighted']
+
+
+def run_signal_backtest(data: pd.DataFrame, strategy: BaseStrategy, signals: pd.DataFrame,
+                        initial_cash: float = 100000.0,
+                        commission: float = 0.001) -> Tuple[Dict[str, Any], float]:
+    """
+    Backtest a strategy on signals it has already generated.
+
+    Args:
+        data (pd.DataFrame): OHLCV data the signals were generated on
+        strategy (BaseStrategy): Strategy that generated the signals
+        signals (pd.DataFrame): Signals with 'Signal' and 'Position' columns
+        initial_cash (float): Initial portfolio cash
+        commission (float): Commission rate per trade
+
+    Returns:
+        Tuple[Dict[str, Any], float]: Backtest results and elapsed seconds
+    """
+    start = time.perf_counter()
+    results = Backtest(data=data, strategy=strategy, initial_cash=initial_cash,
+                       commission=commission).run(signals=signals)
+    return results, time.perf_counter() - start
+
+
+class EnsembleRunner:
+    def __init__(self, strategies: Union[List[StrategySpec], Dict[str, StrategySpec]],
+                 data: pd.DataFrame, combine: str = 'vote',
+                 weights: Optional[Dict[str, float]] = None, threshold: float = 0.0,
+                 initial_cash: float = 100000.0, commission: float = 0.001,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize a runner that evaluates several strategies on one dataset.
+
+        Signals are generated concurrently on a thread pool. The rolling-window
+        and vectorized kernels behind signal generation release the GIL, so this
+        step takes about as long as the slowest strategy. Each strategy is given
+        a shallow copy of the data: it can add its own indicator columns, but the
+        price arrays are shared, never copied.
+
+        The backtests loop over the bars in Python and hold the GIL, so they run
+        on a process pool instead, which pickles the data and the signals to
+        each worker.
+
+        Args:
+            strategies (Union[List[StrategySpec], Dict[str, StrategySpec]]): Strategy instances
+                or (strategy class, parameters) pairs, optionally keyed by name
+            data (pd.DataFrame): OHLCV data shared by all strategies
+            combine (str): 'vote' (majority of the strategies' signals) or 'weighted'
+                (weighted average of the signals)
+            weights (Optional[Dict[str, float]]): Weight of each strategy by name for
+                'weighted' (default: equal weights)
+            threshold (float): Combined score above which the ensemble is long and below
+                minus which it is short
+            initial_cash (float): Initial portfolio cash per strategy
+            commission (float): Commission rate per trade
+            max_workers (Optional[int]): Number of threads and worker processes (default: one per
+                strategy, up to CPU count)
+        """
+        if combine not in COMBINE_METHODS:
+            raise ValueError(f"Unknown combine method: {combine}. Available: {COMBINE_METHODS}")
+
+        self.strategies = self._build_strategies(strategies)
+        self.data = data
+        self.combine = combine
+        self.weights = weights
+        self.threshold = threshold
+        self.initial_cash = initial_cash
+        self.commission = commission
+        self.max_workers = max_workers or min(len(self.strategies), os.cpu_count() or 1)
+        self.failures: Dict[str, str] = {}
+        self.results = None
+
+    def run(self, backtest: bool = True) -> Dict[str, Any]:
+        """
+        Generate every strategy's signals, backtest them and combine them.
+
+        A failing strategy is recorded in ``failures`` and left out of the
+        combined signals.
+
+        Args:
+            backtest (bool): Whether to run a backtest on each strategy's signals
+
+        Returns:
+            Dict[str, Any]: 'signals' and 'results' by strategy name, 'combined' signals,
+                'timings' by strategy name and total 'elapsed' seconds
+        """
+        start = time.perf_counter()
+        signals, results, timings = {}, {}, {}
+        self.failures = {}
+
+        def record(name: str, error: Exception) -> None:
+            self.failures[name] = str(error)
+            print(f"Strategy {name} failed: {error}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._generate, strategy): name
+                for name, strategy in self.strategies.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    signals[name], timings[name] = future.result()
+                except Exception as e:
+                    record(name, e)
+
+        if backtest:
+            args = (self.initial_cash, self.commission)
+            if self.max_workers == 1:
+                for name in list(signals):
+                    try:
+                        results[name], elapsed = run_signal_backtest(
+                            self.data, self.strategies[name], signals[name], *args)
+                    except Exception as e:
+                        record(name, e)
+                        del signals[name]
+                    else:
+                        timings[name] += elapsed
+            else:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = {
+                        executor.submit(run_signal_backtest, self.data, self.strategies[name],
+                                        signals[name], *args): name
+                        for name in signals
+                    }
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            results[name], elapsed = future.result()
+                        except Exception as e:
+                            record(name, e)
+                            del signals[name]
+                        else:
+                            timings[name] += elapsed
+
+        # Keep the configured order rather than the completion order
+        order = [name for name in self.strategies if name in signals]
+        self.results = {
+            'signals': {name: signals[name] for name in order},
+            'results': {name: results[name] for name in order} if backtest else {},
+            'combined': self.combine_signals({name: signals[name] for name in order}),
+            'timings': {name: timings[name] for name in order},
+            'elapsed': time.perf_counter() - start
+        }
+        return self.results
+
+    def combine_signals(self, signals: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Combine the strategies' signal columns into one ensemble signal.
+
+        Args:
+            signals (Dict[str, pd.DataFrame]): Signals by strategy name, each with a 'Signal' column
+
+        Returns:
+            pd.DataFrame: 'Close', each strategy's signal, the combined 'Score' in [-1, 1],
+                and the ensemble 'Signal' and 'Position' columns
+        """
+        names = list(signals)
+        if self.combine == 'weighted' and self.weights is not None:
+            weights = np.array([self.weights.get(name, 0.0) for name in names], dtype='float64')
+        else:
+            weights = np.ones(len(names))
+
+        votes = np.empty((len(self.data), len(names)))
+        for column, name in enumerate(names):
+            np.sign(signals[name]['Signal'].to_numpy(dtype='float64'), out=votes[:, column])
+        np.nan_to_num(votes, copy=False)
+
+        total_weight = np.abs(weights).sum()
+        score = votes @ weights / total_weight if total_weight else np.zeros(len(self.data))
+
+        combined = pd.DataFrame({
+            'Close': self.data['Close'],
+            **{f"Signal_{name}": votes[:, column] for column, name in enumerate(names)},
+            'Score': score
+        }, index=self.data.index)
+        combined['Signal'] = np.where(score > self.threshold, 1, np.where(score < -self.threshold, -1, 0))
+        combined['Position'] = combined['Signal'].diff()
+        return combined
+
+    def get_results(self) -> Dict[str, Any]:
+        """
+        Get the ensemble results.
+
+        Returns:
+            Dict[str, Any]: Ensemble results
+        """
+        if self.results is None:
+            raise ValueError("Ensemble has not been run yet")
+        return self.results
+
+    def _generate(self, strategy: BaseStrategy) -> Tuple[pd.DataFrame, float]:
+        """Generate one strategy's signals on a shallow copy of the data."""
+        start = time.perf_counter()
+        signals = strategy.generate_signals(self.data.copy(deep=False))
+        return signals, time.perf_counter() - start
+
+    @staticmethod
+    def _build_strategies(strategies: Union[List[StrategySpec], Dict[str, StrategySpec]]) -> Dict[str, BaseStrategy]:
+        """Instantiate and name the strategies of the ensemble."""
+        items = strategies.items() if isinstance(strategies, dict) else [(None, spec) for spec in strategies]
+
+        built = {}
+        for name, spec in items:
+            if isinstance(spec, BaseStrategy):
+                strategy = spec
+            else:
+                strategy_class, parameters = spec
+                strategy = strategy_class(parameters)
+            if not strategy.validate_parameters():
+                raise ValueError(f"Invalid parameters for {type(strategy).__name__}")
+
+            if name is None:
+                # Number repeated classes: MovingAverageCrossover, MovingAverageCrossover_2, ...
+                base = type(strategy).__name__
+                name = base
+                count = 1
+                while name in built:
+                    count += 1
+                    name = f"{base}_{count}"
+            built[name] = strategy
+
+        if not built:
+            raise ValueError("At least one strategy is required")
+        return built
@@ -0,0 +1,255 @@
+import gc
+import heapq
+from abc import ABC, abstractmethod
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.engine.portfolio import Portfolio
+
+
+class Bar(NamedTuple):
+    """
+    A closed bar of one stream.
+
+    Times are nanoseconds since the epoch. Bars compare by close time first
+    and stream priority second, which is the order the engine delivers them in.
+    """
+    close_time: int
+    priority: int
+    stream: str
+    symbol: str
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class BarStream:
+    def __init__(self, name: str, source: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                 bar_duration: Union[str, pd.Timedelta], symbol: Optional[str] = None):
+        """
+        Initialize a timestamped stream of OHLCV bars.
+
+        Args:
+            name (str): Unique stream name, e.g. 'AAPL_1min'
+            source (Union[pd.DataFrame, Iterable[pd.DataFrame]]): OHLCV data with a datetime
+                index, or an iterable of such chunks in time order (e.g. DataLoader.iter_csv)
+            bar_duration (Union[str, pd.Timedelta]): Time from a bar's index label to its close.
+                Use the bar length for open-labelled bars, such as DataLoader data labelled
+                by session date, and '0s' only for bars labelled by their close time.
+            symbol (Optional[str]): Traded symbol of the stream (default: the stream name)
+        """
+        self.name = name
+        self.source = source
+        self.bar_duration = pd.Timedelta(bar_duration)
+        self.symbol = symbol or name
+
+    def chunks(self, chunksize: int = 65536) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the source data in chunks.
+
+        Args:
+            chunksize (int): Rows per chunk when the source is a single DataFrame
+
+        Returns:
+            Iterator[pd.DataFrame]: OHLCV chunks
+        """
+        if isinstance(self.source, pd.DataFrame):
+            for start in range(0, len(self.source), chunksize):
+                yield self.source.iloc[start:start + chunksize]
+        else:
+            yield from self.source
+
+    def bars(self, priority: int) -> Iterator[Bar]:
+        """
+        Lazily convert the source data into bars keyed by close time.
+
+        Only one chunk is materialized as bars at a time.
+
+        Args:
+            priority (int): Tie-break rank for bars closing at the same time
+
+        Returns:
+            Iterator[Bar]: Bars in close-time order
+        """
+        duration = self.bar_duration.value
+        last_close = None
+        for chunk in self.chunks():
+            if chunk.empty:
+                continue
+            timestamps = chunk.index.values.astype('datetime64[ns]').view('int64')
+            close_times = timestamps + duration
+            if np.any(np.diff(close_times) < 0) or (last_close is not None and close_times[0] < last_close):
+                raise ValueError(f"Stream {self.name} is not sorted by time")
+            last_close = close_times[-1]
+
+            # Build the tuples with zip and give them the Bar type directly,
+            # which skips the per-bar Python-level NamedTuple constructor.
+            # Bars hold no references to containers, so the cyclic garbage
+            # collector is paused while a chunk's worth of them is allocated.
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                bars = list(map(tuple.__new__, repeat(Bar), zip(
+                    close_times.tolist(),
+                    repeat(priority),
+                    repeat(self.name),
+                    repeat(self.symbol),
+                    timestamps.tolist(),
+                    chunk['Open'].tolist(),
+                    chunk['High'].tolist(),
+                    chunk['Low'].tolist(),
+                    chunk['Close'].tolist(),
+                    chunk['Volume'].tolist()
+                )))
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            yield from bars
+
+
+class EventStrategy(ABC):
+    """
+    Abstract base class for strategies driven by the event engine.
+    """
+
+    @abstractmethod
+    def on_bar(self, bar: Bar, engine: 'EventEngine') -> None:
+        """
+        Handle a bar that has just closed.
+
+        Args:
+            bar (Bar): The closed bar
+            engine (EventEngine): Engine giving access to the latest closed bars and the portfolio
+        """
+        pass
+
+
+class EventEngine:
+    def __init__(self, streams: List[BarStream], initial_cash: float = 100000.0,
+                 commission: float = 0.001):
+        """
+        Initialize an event-driven engine over several bar streams.
+
+        Streams can have different resolutions or symbols. They are merged
+        lazily in close-time order with a heap, so a strategy only ever sees
+        bars that have closed. Bars closing at the same time are delivered in
+        the order the streams are listed.
+
+        Args:
+            streams (List[BarStream]): Bar streams to merge
+            initial_cash (float): Initial portfolio cash
+            commission (float): Commission rate per trade
+        """
+        names = [stream.name for stream in streams]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Stream names must be unique: {names}")
+
+        self.streams = streams
+        self.portfolio = Portfolio(initial_cash=initial_cash, commission=commission)
+        self.latest: Dict[str, Bar] = {}  # stream name -> last closed bar
+        self.prices: Dict[str, float] = {}  # symbol -> last closed price
+        self.now: Optional[int] = None  # close time of the bar being processed
+        self.results = None
+
+    def events(self) -> Iterator[Bar]:
+        """
+        Merge all streams into a single time-ordered iterator of bars.
+
+        Returns:
+            Iterator[Bar]: Bars from every stream in close-time order
+        """
+        return heapq.merge(*(stream.bars(priority) for priority, stream in enumerate(self.streams)))
+
+    def run(self, strategy: Union[EventStrategy, Callable[[Bar, 'EventEngine'], None]],
+            mark_stream: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the strategy over the merged streams.
+
+        Args:
+            strategy (Union[EventStrategy, Callable]): Strategy, or a callable taking (bar, engine)
+            mark_stream (Optional[str]): Stream whose bars trigger an equity update
+                (default: no equity curve is recorded)
+
+        Returns:
+            Dict[str, Any]: Results including equity curve, trade history and event count
+        """
+        if mark_stream is not None and mark_stream not in {stream.name for stream in self.streams}:
+            raise ValueError(f"Unknown mark stream: {mark_stream}")
+
+        on_bar = strategy.on_bar if isinstance(strategy, EventStrategy) else strategy
+        latest = self.latest
+        prices = self.prices
+        portfolio = self.portfolio
+        events = 0
+
+        for bar in self.events():
+            self.now = bar.close_time
+            latest[bar.stream] = bar
+            prices[bar.symbol] = bar.close
+            on_bar(bar, self)
+            if bar.stream == mark_stream:
+                portfolio.update_equity(pd.Timestamp(bar.close_time), prices)
+            events += 1
+
+        equity_curve = portfolio.get_equity_curve()
+        trade_history = portfolio.get_trade_history()
+        position_value = sum(quantity * prices[symbol] for symbol, quantity in portfolio.positions.items())
+
+        self.results = {
+            'equity_curve': equity_curve,
+            'trade_history': trade_history,
+            'final_equity': portfolio.cash + position_value,
+            'total_trades': len(trade_history) if not trade_history.empty else 0,
+            'events': events
+        }
+
+        return self.results
+
+    def buy(self, symbol: str, quantity: float) -> None:
+        """
+        Buy at the last closed price of a symbol.
+
+        Args:
+            symbol (str): Trading symbol
+            quantity (float): Quantity to buy
+        """
+        self._trade(symbol, quantity, 'BUY')
+
+    def sell(self, symbol: str, quantity: float) -> None:
+        """
+        Sell at the last closed price of a symbol.
+
+        Args:
+            symbol (str): Trading symbol
+            quantity (float): Quantity to sell
+        """
+        self._trade(symbol, quantity, 'SELL')
+
+    def _trade(self, symbol: str, quantity: float, trade_type: str) -> None:
+        """Execute a trade at the last closed price and the current event time."""
+        if symbol not in self.prices:
+            raise ValueError(f"No closed bar yet for symbol: {symbol}")
+        self.portfolio.execute_trade(
+            symbol=symbol,
+            timestamp=pd.Timestamp(self.now),
+            price=self.prices[symbol],
+            quantity=quantity,
+            trade_type=trade_type
+        )
+
+    def get_results(self) -> Dict[str, Any]:
+        """
+        Get the engine results.
+
+        Returns:
+            Dict[str, Any]: Engine results
+        """
+        if self.results is None:
+            raise ValueError("Engine has not been run yet")
+        return self.results
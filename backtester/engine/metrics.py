@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from backtester.engine.trades import match_round_trips
+
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0.01, periods_per_year=252):
     """
@@ -37,16 +39,21 @@ def calculate_win_rate(trade_history):
     """
     Calculate the win rate from a trade history.
     
+    Fills are paired into round trips first in first out, and a round trip
+    counts as a win when its P&L after commission is positive.
+    
     Args:
-        trade_history (pd.DataFrame): DataFrame containing trade history with 'value' column
+        trade_history (pd.DataFrame): DataFrame containing trade history
     
     Returns:
         float: Win rate as a percentage
     """
     if trade_history.empty:
         return 0.0
-    profitable_trades = trade_history[trade_history['value'] > 0]
-    return len(profitable_trades) / len(trade_history)
+    round_trips = match_round_trips(trade_history)
+    if round_trips.empty:
+        return 0.0
+    return (round_trips['pnl'] > 0).mean()
 
 
 def calculate_cagr(equity_curve, periods_per_year=252):
@@ -81,6 +88,161 @@ def calculate_volatility(returns, periods_per_year=252):
     return returns.std() * np.sqrt(periods_per_year)
 
 
+def _as_columns(values):
+    """
+    Convert a curve or a batch of curves to a 2D float array with time along axis 0.
+    
+    Args:
+        values (Union[pd.Series, pd.DataFrame, np.ndarray]): One curve, or one curve per column
+    
+    Returns:
+        tuple: 2D array and a function that wraps a result array like the input
+    """
+    if isinstance(values, pd.Series):
+        return (values.to_numpy(dtype='float64').reshape(-1, 1),
+                lambda result: pd.Series(result[:, 0], index=values.index, name=values.name))
+    if isinstance(values, pd.DataFrame):
+        return (values.to_numpy(dtype='float64'),
+                lambda result: pd.DataFrame(result, index=values.index, columns=values.columns))
+    array = np.asarray(values, dtype='float64')
+    if array.ndim == 1:
+        return array.reshape(-1, 1), lambda result: result[:, 0]
+    return array, lambda result: result
+
+
+def _rolling_moments(values, window):
+    """
+    Compute rolling means and sample standard deviations with running sums.
+    
+    Each window sum is the difference of two cumulative sums, so the cost is
+    linear in the length of the data whatever the window. Values are centred
+    on their column mean first to limit cancellation in the squared sums.
+    Windows that contain a NaN give NaN, as with pandas rolling.
+    
+    Args:
+        values (np.ndarray): 2D array with time along axis 0
+        window (int): Window length in periods
+    
+    Returns:
+        tuple: Rolling mean and rolling standard deviation arrays
+    """
+    n = len(values)
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if window < 2 or n < window:
+        return mean, std
+    
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+    center = filled.sum(axis=0) / np.maximum((~missing).sum(axis=0), 1)
+    centred = np.where(missing, 0.0, filled - center)
+    
+    zeros = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(centred, axis=0)])
+    squares = np.concatenate([zeros, np.cumsum(centred ** 2, axis=0)])
+    gaps = np.concatenate([zeros, np.cumsum(missing, axis=0)])
+    
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    complete = (gaps[window:] - gaps[:-window]) == 0
+    
+    variance = np.maximum(window_squares - window_sum ** 2 / window, 0.0) / (window - 1)
+    mean[window - 1:] = np.where(complete, window_sum / window + center, np.nan)
+    std[window - 1:] = np.where(complete, np.sqrt(variance), np.nan)
+    return mean, std
+
+
+def _rolling_max(values, window):
+    """
+    Compute a rolling maximum in linear time (van Herk/Gil-Werman).
+    
+    The series is cut into blocks of the window length. The maximum of any
+    window is the larger of the running maximum from the start of its last
+    block and the running maximum to the end of its first block, both of
+    which are computed with one accumulate pass per block.
+    
+    Args:
+        values (np.ndarray): 2D array with time along axis 0
+        window (int): Window length in periods
+    
+    Returns:
+        np.ndarray: Rolling maximum, NaN for the first window - 1 periods
+    """
+    n, columns = values.shape
+    result = np.full(values.shape, np.nan)
+    if window < 1 or n < window:
+        return result
+    
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, columns), -np.inf)
+    padded[:n] = np.where(np.isnan(values), -np.inf, values)
+    padded = padded.reshape(blocks, window, columns)
+    
+    from_block_start = np.maximum.accumulate(padded, axis=1).reshape(-1, columns)
+    to_block_end = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, columns)
+    
+    result[window - 1:] = np.maximum(to_block_end[:n - window + 1], from_block_start[window - 1:n])
+    return result
+
+
+def calculate_rolling_volatility(returns, window=252, periods_per_year=252):
+    """
+    Calculate the annualized volatility over a rolling window.
+    
+    Args:
+        returns (Union[pd.Series, pd.DataFrame, np.ndarray]): Returns of one curve, or of one
+            curve per column
+        window (int): Window length in periods
+        periods_per_year (int): Number of periods in a year (e.g., 252 for daily data)
+    
+    Returns:
+        Union[pd.Series, pd.DataFrame, np.ndarray]: Rolling annualized volatility, shaped like returns
+    """
+    values, wrap = _as_columns(returns)
+    _, std = _rolling_moments(values, window)
+    return wrap(std * np.sqrt(periods_per_year))
+
+
+def calculate_rolling_sharpe_ratio(returns, window=252, risk_free_rate=0.01, periods_per_year=252):
+    """
+    Calculate the Sharpe Ratio over a rolling window.
+    
+    Args:
+        returns (Union[pd.Series, pd.DataFrame, np.ndarray]): Returns of one curve, or of one
+            curve per column
+        window (int): Window length in periods
+        risk_free_rate (float): Annual risk-free rate
+        periods_per_year (int): Number of periods in a year (e.g., 252 for daily data)
+    
+    Returns:
+        Union[pd.Series, pd.DataFrame, np.ndarray]: Rolling Sharpe Ratio, shaped like returns
+    """
+    values, wrap = _as_columns(returns)
+    mean, std = _rolling_moments(values, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.sqrt(periods_per_year) * (mean - risk_free_rate / periods_per_year) / std
+    return wrap(sharpe)
+
+
+def calculate_rolling_drawdown(equity_curve, window=252):
+    """
+    Calculate the drawdown from the highest equity within a rolling window.
+    
+    Args:
+        equity_curve (Union[pd.Series, pd.DataFrame, np.ndarray]): Equity values of one curve,
+            or of one curve per column
+        window (int): Window length in periods
+    
+    Returns:
+        Union[pd.Series, pd.DataFrame, np.ndarray]: Drawdown as a percentage of the rolling
+            peak, shaped like equity_curve
+    """
+    values, wrap = _as_columns(equity_curve)
+    peak = _rolling_max(values, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return wrap((values - peak) / peak)
+
+
 def generate_performance_report(equity_curve, trade_history, risk_free_rate=0.01, periods_per_year=252):
     """
     Generate a comprehensive performance report for the backtest.
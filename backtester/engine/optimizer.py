@@ -0,0 +1,238 @@
+import contextlib
+import io
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from backtester.engine.backtest import Backtest
+from backtester.engine.metrics import generate_performance_report
+from backtester.strategies.base_strategy import BaseStrategy
+
+# Data shared by every evaluation in a worker process, set once by the pool initializer
+_worker_data: Optional[pd.DataFrame] = None
+
+
+def _init_worker(data: pd.DataFrame) -> None:
+    """Store the optimization data in the worker process."""
+    global _worker_data
+    _worker_data = data
+
+
+def evaluate_candidate(strategy_class: Type[BaseStrategy], parameters: Dict[str, Any],
+                       n_bars: int, metric: str, initial_cash: float,
+                       commission: float) -> float:
+    """
+    Backtest one candidate on the first n_bars of the worker's data.
+
+    Args:
+        strategy_class (Type[BaseStrategy]): Strategy class to instantiate
+        parameters (Dict[str, Any]): Candidate strategy parameters
+        n_bars (int): Number of bars from the start of the history to use
+        metric (str): Key of generate_performance_report used as the score
+        initial_cash (float): Initial portfolio cash
+        commission (float): Commission rate per trade
+
+    Returns:
+        float: Candidate score, NaN if the metric is undefined on this prefix
+    """
+    strategy = strategy_class(parameters)
+    backtest = Backtest(data=_worker_data.iloc[:n_bars].copy(), strategy=strategy,
+                        initial_cash=initial_cash, commission=commission)
+
+    # Failed trades are reported per bar, which floods the output of a search
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = backtest.run()
+
+    equity_curve = results['equity_curve']
+    if len(equity_curve) < 2:
+        return float('nan')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        report = generate_performance_report(equity_curve['total_equity'], results['trade_history'])
+    return float(report[metric])
+
+
+def expand_parameter_grid(strategy_class: Type[BaseStrategy],
+                          param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid, keeping the combinations the strategy accepts.
+
+    Args:
+        strategy_class (Type[BaseStrategy]): Strategy class used to validate each combination
+        param_grid (Dict[str, List[Any]]): Candidate values for each parameter
+
+    Returns:
+        List[Dict[str, Any]]: Parameter sets that pass validate_parameters
+    """
+    names = list(param_grid)
+    candidates = []
+    for values in itertools.product(*(param_grid[name] for name in names)):
+        # Grids built with numpy would otherwise fail the isinstance checks
+        parameters = {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in zip(names, values)
+        }
+        if strategy_class(parameters).validate_parameters():
+            candidates.append(parameters)
+    return candidates
+
+
+class SuccessiveHalvingOptimizer:
+    def __init__(self, strategy_class: Type[BaseStrategy], param_grid: Dict[str, List[Any]],
+                 data: pd.DataFrame, metric: str = 'Sharpe Ratio', maximize: bool = True,
+                 eta: int = 3, min_fraction: Optional[float] = None, min_bars: int = 100,
+                 initial_cash: float = 100000.0, commission: float = 0.001,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize an adaptive parameter search using successive halving.
+
+        All valid candidates are first scored on a short prefix of the history.
+        Only the best 1/eta of them survive to the next rung, where the prefix
+        is eta times longer, until the survivors are scored on the full history.
+
+        Args:
+            strategy_class (Type[BaseStrategy]): Strategy class to optimize
+            param_grid (Dict[str, List[Any]]): Candidate values for each parameter
+            data (pd.DataFrame): Historical OHLCV data
+            metric (str): Key of generate_performance_report to optimize
+            maximize (bool): Whether higher metric values are better
+            eta (int): Reduction factor between rungs
+            min_fraction (Optional[float]): Fraction of history used by the first rung
+                (default: chosen so that the last rung keeps about one candidate)
+            min_bars (int): Minimum prefix length in bars
+            initial_cash (float): Initial portfolio cash
+            commission (float): Commission rate per trade
+            max_workers (Optional[int]): Number of worker processes (default: CPU count)
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        if min_fraction is not None and not 0 < min_fraction <= 1:
+            raise ValueError("min_fraction must be in (0, 1]")
+
+        self.strategy_class = strategy_class
+        self.param_grid = param_grid
+        self.data = data
+        self.metric = metric
+        self.maximize = maximize
+        self.eta = eta
+        self.min_fraction = min_fraction
+        self.min_bars = min_bars
+        self.initial_cash = initial_cash
+        self.commission = commission
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.results = None
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """
+        Expand the parameter grid, keeping the combinations the strategy accepts.
+
+        Returns:
+            List[Dict[str, Any]]: Parameter sets that pass validate_parameters
+        """
+        return expand_parameter_grid(self.strategy_class, self.param_grid)
+
+    def budgets(self, n_candidates: int) -> List[int]:
+        """
+        Compute the prefix length of each rung.
+
+        Args:
+            n_candidates (int): Number of candidates in the first rung
+
+        Returns:
+            List[int]: Number of bars per rung, ending with the full history
+        """
+        total = len(self.data)
+        min_fraction = self.min_fraction
+        if min_fraction is None:
+            rungs = int(math.floor(math.log(max(n_candidates, 1), self.eta)))
+            min_fraction = float(self.eta) ** -rungs
+
+        budgets = []
+        fraction = min_fraction
+        while fraction < 1:
+            n_bars = min(max(int(total * fraction), self.min_bars), total)
+            if not budgets or n_bars > budgets[-1]:
+                budgets.append(n_bars)
+            fraction *= self.eta
+        if not budgets or budgets[-1] < total:
+            budgets.append(total)
+        return budgets
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the search.
+
+        Returns:
+            Dict[str, Any]: Best parameters and score, the per-rung history, and the
+                number of bars evaluated compared with a full grid search
+        """
+        candidates = self.candidates()
+        if not candidates:
+            raise ValueError(f"No valid parameters for {self.strategy_class.__name__} in the grid")
+
+        budgets = self.budgets(len(candidates))
+        history = []
+        bars_evaluated = 0
+        survivors = candidates
+
+        with self._executor() as executor:
+            for rung, n_bars in enumerate(budgets):
+                args = [
+                    (self.strategy_class, parameters, n_bars, self.metric,
+                     self.initial_cash, self.commission)
+                    for parameters in survivors
+                ]
+                if executor is None:
+                    scores = [evaluate_candidate(*arg) for arg in args]
+                else:
+                    scores = list(executor.map(evaluate_candidate, *zip(*args)))
+                bars_evaluated += n_bars * len(survivors)
+
+                for parameters, score in zip(survivors, scores):
+                    history.append({'rung': rung, 'n_bars': n_bars, **parameters, 'score': score})
+
+                # Undefined scores (e.g. no trades yet on a short prefix) rank last
+                keys = [
+                    -np.inf if np.isnan(score) else (score if self.maximize else -score)
+                    for score in scores
+                ]
+                order = sorted(range(len(survivors)), key=lambda i: keys[i], reverse=True)
+
+                if rung == len(budgets) - 1:
+                    best = order[0]
+                    best_parameters, best_score = survivors[best], scores[best]
+                else:
+                    keep = max(1, len(survivors) // self.eta)
+                    survivors = [survivors[i] for i in order[:keep]]
+
+        self.results = {
+            'best_parameters': best_parameters,
+            'best_score': best_score,
+            'history': pd.DataFrame(history),
+            'bars_evaluated': bars_evaluated,
+            'full_grid_bars': len(candidates) * len(self.data)
+        }
+        return self.results
+
+    def get_results(self) -> Dict[str, Any]:
+        """
+        Get the search results.
+
+        Returns:
+            Dict[str, Any]: Search results
+        """
+        if self.results is None:
+            raise ValueError("Optimizer has not been run yet")
+        return self.results
+
+    def _executor(self):
+        """Create the worker pool, or a no-op context with the data set in-process when serial."""
+        if self.max_workers == 1:
+            _init_worker(self.data)
+            return contextlib.nullcontext()
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                   initargs=(self.data,))
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import pandas as pd
 import numpy as np
 
@@ -12,6 +12,7 @@ class Trade:
     quantity: float
     value: float
     commission: float = 0.0
+    symbol: Optional[str] = None
 
 class Portfolio:
     def __init__(self, initial_cash: float = 100000.0, commission: float = 0.001):
@@ -43,7 +44,11 @@ class Portfolio:
         """
         if trade_type not in ['BUY', 'SELL']:
             raise ValueError("trade_type must be 'BUY' or 'SELL'")
-            
+        
+        # Keep cash accounting in float64 even when prices arrive as float32
+        price = float(price)
+        quantity = float(quantity)
+        
         commission_amount = price * quantity * self.commission
         trade_value = price * quantity
         
@@ -66,7 +71,8 @@ class Portfolio:
             price=price,
             quantity=quantity,
             value=trade_value,
-            commission=commission_amount
+            commission=commission_amount,
+            symbol=symbol
         )
         self.trades.append(trade)
         
@@ -79,7 +85,7 @@ class Portfolio:
             current_prices (Dict[str, float]): Current prices for each position
         """
         position_value = sum(
-            quantity * current_prices[symbol]
+            quantity * float(current_prices[symbol])
             for symbol, quantity in self.positions.items()
         )
         total_equity = self.cash + position_value
@@ -91,6 +97,40 @@ class Portfolio:
             'total_equity': total_equity
         })
         
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Capture the portfolio state, including the trade and equity ledgers.
+        
+        Returns:
+            Dict[str, Any]: Portfolio state that can be restored with from_checkpoint
+        """
+        return {
+            'initial_cash': self.initial_cash,
+            'cash': self.cash,
+            'commission': self.commission,
+            'positions': dict(self.positions),
+            'trades': list(self.trades),
+            'equity_history': list(self.equity_history)
+        }
+    
+    @classmethod
+    def from_checkpoint(cls, state: Dict[str, Any]) -> 'Portfolio':
+        """
+        Restore a portfolio from a checkpointed state.
+        
+        Args:
+            state (Dict[str, Any]): State returned by checkpoint
+            
+        Returns:
+            Portfolio: Portfolio with the saved cash, positions and ledgers
+        """
+        portfolio = cls(initial_cash=state['initial_cash'], commission=state['commission'])
+        portfolio.cash = state['cash']
+        portfolio.positions = dict(state['positions'])
+        portfolio.trades = list(state['trades'])
+        portfolio.equity_history = list(state['equity_history'])
+        return portfolio
+    
     def get_equity_curve(self) -> pd.DataFrame:
         """
         Get the portfolio equity curve as a DataFrame.
@@ -122,7 +162,8 @@ class Portfolio:
                 'price': trade.price,
                 'quantity': trade.quantity,
                 'value': trade.value,
-                'commission': trade.commission
+                'commission': trade.commission,
+                'symbol': trade.symbol
             }
             for trade in self.trades
         ]
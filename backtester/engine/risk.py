@@ -0,0 +1,352 @@
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+METHODS = ['fixed', 'vol_target', 'risk_parity']
+ESTIMATORS = ['ewma', 'rolling']
+
+
+class EWMACovariance:
+    def __init__(self, symbols: List[str], halflife: float = 20.0, min_periods: int = 20):
+        """
+        Initialize an exponentially weighted covariance matrix of returns.
+
+        Each update decays the matrix and adds the outer product of the new
+        returns, so a bar costs O(N^2) for N symbols whatever the history length.
+        Returns are assumed to have zero mean, as in RiskMetrics.
+
+        Args:
+            symbols (List[str]): Symbols of the matrix rows and columns
+            halflife (float): Number of bars after which an observation's weight halves
+            min_periods (int): Number of updates before the estimate is used
+        """
+        self.symbols = list(symbols)
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.min_periods = min_periods
+        self.matrix = np.zeros((len(self.symbols), len(self.symbols)))
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough returns have been seen to use the estimate."""
+        return self.count >= self.min_periods
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Add one bar of returns.
+
+        Args:
+            returns (np.ndarray): Return of each symbol, NaN when it has none this bar
+        """
+        returns = np.nan_to_num(np.asarray(returns, dtype='float64'))
+        self.matrix *= self.decay
+        self.matrix += np.outer((1.0 - self.decay) * returns, returns)
+        self.count += 1
+
+    def covariance(self) -> np.ndarray:
+        """
+        Get the covariance matrix per bar.
+
+        Returns:
+            np.ndarray: Covariance matrix, corrected for the weights missing early on
+        """
+        if self.count == 0:
+            return self.matrix.copy()
+        return self.matrix / (1.0 - self.decay ** self.count)
+
+
+class RollingCovariance:
+    def __init__(self, symbols: List[str], window: int = 60, min_periods: Optional[int] = None):
+        """
+        Initialize a covariance matrix of returns over a trailing window.
+
+        Running sums of the returns and their outer products are updated with the
+        bar entering and the bar leaving the window, so a bar costs O(N^2) for
+        N symbols. The sums are rebuilt from the window once per window length
+        to stop rounding errors from accumulating.
+
+        Args:
+            symbols (List[str]): Symbols of the matrix rows and columns
+            window (int): Number of bars in the window
+            min_periods (Optional[int]): Number of updates before the estimate is used (default: window)
+        """
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        n = len(self.symbols)
+        self.buffer = np.zeros((window, n))
+        self.total = np.zeros(n)
+        self.products = np.zeros((n, n))
+        self.position = 0
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough returns have been seen to use the estimate."""
+        return self.count >= max(self.min_periods, 2)
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Add one bar of returns.
+
+        Args:
+            returns (np.ndarray): Return of each symbol, NaN when it has none this bar
+        """
+        returns = np.nan_to_num(np.asarray(returns, dtype='float64'))
+        if self.count >= self.window:
+            leaving = self.buffer[self.position]
+            self.total -= leaving
+            self.products -= np.outer(leaving, leaving)
+
+        self.buffer[self.position] = returns
+        self.total += returns
+        self.products += np.outer(returns, returns)
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+
+        if self.count % self.window == 0:
+            self.total = self.buffer.sum(axis=0)
+            self.products = self.buffer.T @ self.buffer
+
+    def covariance(self) -> np.ndarray:
+        """
+        Get the covariance matrix per bar.
+
+        Returns:
+            np.ndarray: Sample covariance matrix of the returns in the window
+        """
+        n = min(self.count, self.window)
+        if n < 2:
+            return np.zeros_like(self.products)
+        mean = self.total / n
+        return (self.products - n * np.outer(mean, mean)) / (n - 1)
+
+
+class RiskManager:
+    def __init__(self, method: str = 'vol_target', estimator: str = 'ewma',
+                 symbols: Optional[List[str]] = None, halflife: float = 20.0, window: int = 60,
+                 min_periods: int = 20, target_volatility: float = 0.10,
+                 risk_per_trade: float = 0.02, var_limit: Optional[float] = None,
+                 confidence: float = 0.99, max_leverage: float = 1.0,
+                 periods_per_year: int = 252):
+        """
+        Initialize a risk manager that sizes positions from a covariance of returns.
+
+        Call update with every bar's prices to keep the covariance current,
+        and target_weights or position_size to size positions.
+
+        Args:
+            method (str): 'fixed' (risk_per_trade of equity per position), 'vol_target'
+                (inverse-volatility weights scaled to target_volatility) or 'risk_parity'
+                (equal risk contributions, scaled to target_volatility)
+            estimator (str): 'ewma' or 'rolling' covariance
+            symbols (Optional[List[str]]): Symbols to track (default: those of the first update)
+            halflife (float): Half-life in bars of the 'ewma' estimator
+            window (int): Window in bars of the 'rolling' estimator
+            min_periods (int): Number of returns before sizing uses the covariance;
+                until then positions are sized as with 'fixed'
+            target_volatility (float): Annual volatility targeted by the portfolio
+            risk_per_trade (float): Fraction of equity per position for 'fixed'
+            var_limit (Optional[float]): Maximum one-bar value at risk as a fraction of equity,
+                applied with every method; no position is taken before min_periods returns,
+                while the value at risk cannot be estimated
+            confidence (float): Confidence level of the value at risk
+            max_leverage (float): Maximum sum of absolute weights
+            periods_per_year (int): Number of bars in a year
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown sizing method: {method}. Available: {METHODS}")
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown covariance estimator: {estimator}. Available: {ESTIMATORS}")
+
+        self.method = method
+        self.estimator = estimator
+        self.halflife = halflife
+        self.window = window
+        self.min_periods = min_periods
+        self.target_volatility = target_volatility
+        self.risk_per_trade = risk_per_trade
+        self.var_limit = var_limit
+        self.confidence = confidence
+        self.max_leverage = max_leverage
+        self.periods_per_year = periods_per_year
+
+        self.symbols: Optional[List[str]] = None
+        self.covariance: Union[EWMACovariance, RollingCovariance, None] = None
+        self.last_prices: Optional[np.ndarray] = None
+        if symbols is not None:
+            self._build(symbols)
+
+    def update(self, prices: Dict[str, float]) -> None:
+        """
+        Add one bar of prices and update the covariance with their log returns.
+
+        Args:
+            prices (Dict[str, float]): Price of each symbol this bar; missing symbols
+                count as unchanged
+        """
+        if self.covariance is None:
+            self._build(sorted(prices))
+        unknown = set(prices) - set(self.symbols)
+        if unknown:
+            raise ValueError(f"Unknown symbols: {sorted(unknown)}")
+
+        current = np.array([prices.get(symbol, np.nan) for symbol in self.symbols], dtype='float64')
+        if self.last_prices is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.covariance.update(np.log(current / self.last_prices))
+            self.last_prices = np.where(np.isfinite(current), current, self.last_prices)
+        else:
+            self.last_prices = current
+
+    def target_weights(self, signals: Dict[str, float]) -> Dict[str, float]:
+        """
+        Size a book of positions as fractions of equity.
+
+        Args:
+            signals (Dict[str, float]): Direction of each position (positive for long,
+                negative for short, zero for flat)
+
+        Returns:
+            Dict[str, float]: Signed weight of each symbol
+        """
+        weights = {symbol: 0.0 for symbol in signals}
+        active = [symbol for symbol, signal in signals.items() if signal != 0]
+        if not active:
+            return weights
+        signs = np.sign([signals[symbol] for symbol in active])
+
+        covariance = None
+        if self.covariance is not None and self.covariance.ready:
+            positions = [self._position(symbol) for symbol in active]
+            covariance = self.covariance.covariance()[np.ix_(positions, positions)]
+        elif self.var_limit is not None:
+            # The value at risk cannot be checked yet, so stay flat
+            return weights
+
+        if self.method == 'fixed' or covariance is None:
+            raw = signs * self.risk_per_trade
+        else:
+            raw = self._risk_weights(signs, covariance)
+
+        raw = self._apply_limits(raw, covariance)
+        weights.update(zip(active, raw.tolist()))
+        return weights
+
+    def position_size(self, symbol: str, price: float, portfolio_value: float,
+                      signals: Optional[Dict[str, float]] = None) -> float:
+        """
+        Calculate the number of shares to hold in a symbol.
+
+        Args:
+            symbol (str): Symbol to size
+            price (float): Current price
+            portfolio_value (float): Current portfolio value
+            signals (Optional[Dict[str, float]]): Directions of the whole book
+                (default: a single long position in symbol)
+
+        Returns:
+            float: Absolute number of shares
+        """
+        weights = self.target_weights(signals if signals is not None else {symbol: 1})
+        return abs(weights.get(symbol, 0.0)) * portfolio_value / price
+
+    def portfolio_volatility(self, weights: Dict[str, float]) -> float:
+        """
+        Calculate the annual volatility of a book under the current covariance.
+
+        Args:
+            weights (Dict[str, float]): Signed weight of each symbol
+
+        Returns:
+            float: Annualized volatility
+        """
+        w, covariance = self._book(weights)
+        return float(np.sqrt(max(w @ covariance @ w, 0.0) * self.periods_per_year))
+
+    def value_at_risk(self, weights: Dict[str, float]) -> float:
+        """
+        Calculate the parametric one-bar value at risk of a book.
+
+        Args:
+            weights (Dict[str, float]): Signed weight of each symbol
+
+        Returns:
+            float: Loss not exceeded with the configured confidence, as a fraction of equity
+        """
+        w, covariance = self._book(weights)
+        return float(NormalDist().inv_cdf(self.confidence) * np.sqrt(max(w @ covariance @ w, 0.0)))
+
+    def _build(self, symbols: List[str]) -> None:
+        """Create the covariance estimator for a set of symbols."""
+        self.symbols = list(symbols)
+        if self.estimator == 'ewma':
+            self.covariance = EWMACovariance(self.symbols, halflife=self.halflife, min_periods=self.min_periods)
+        else:
+            self.covariance = RollingCovariance(self.symbols, window=self.window, min_periods=self.min_periods)
+
+    def _position(self, symbol: str) -> int:
+        """Get the row of a symbol in the covariance matrix."""
+        if self.symbols is None or symbol not in self.symbols:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return self.symbols.index(symbol)
+
+    def _book(self, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the weight vector and covariance matrix of a book."""
+        if self.covariance is None:
+            raise ValueError("Risk manager has not been updated yet")
+        positions = [self._position(symbol) for symbol in weights]
+        return (np.array(list(weights.values()), dtype='float64'),
+                self.covariance.covariance()[np.ix_(positions, positions)])
+
+    def _risk_weights(self, signs: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+        """Compute signed weights scaled to the target volatility."""
+        variances = np.maximum(np.diag(covariance), 1e-18)
+        if self.method == 'risk_parity':
+            magnitudes = self._equal_risk_contributions(covariance * np.outer(signs, signs))
+        else:
+            magnitudes = 1.0 / np.sqrt(variances)
+
+        weights = signs * magnitudes
+        volatility = np.sqrt(max(weights @ covariance @ weights, 0.0) * self.periods_per_year)
+        if volatility == 0:
+            return signs * self.risk_per_trade
+        return weights * self.target_volatility / volatility
+
+    @staticmethod
+    def _equal_risk_contributions(covariance: np.ndarray, iterations: int = 100,
+                                  tolerance: float = 1e-10) -> np.ndarray:
+        """
+        Solve for positive weights whose risk contributions are equal.
+
+        Cyclical coordinate descent: each weight in turn solves the quadratic
+        that equalizes its contribution given the others.
+        """
+        n = len(covariance)
+        budget = 1.0 / n
+        variances = np.maximum(np.diag(covariance), 1e-18)
+        weights = 1.0 / np.sqrt(variances)
+        weights /= weights.sum()
+
+        for _ in range(iterations):
+            previous = weights.copy()
+            for i in range(n):
+                cross = covariance[i] @ weights - covariance[i, i] * weights[i]
+                weights[i] = (-cross + np.sqrt(cross * cross + 4.0 * variances[i] * budget)) / (2.0 * variances[i])
+            if np.abs(weights - previous).max() <= tolerance * np.abs(weights).max():
+                break
+        return weights
+
+    def _apply_limits(self, weights: np.ndarray, covariance: Optional[np.ndarray]) -> np.ndarray:
+        """Scale weights down to the leverage and value-at-risk limits."""
+        scale = 1.0
+        leverage = np.abs(weights).sum()
+        if leverage > self.max_leverage:
+            scale = self.max_leverage / leverage
+
+        if self.var_limit is not None and covariance is not None:
+            value_at_risk = NormalDist().inv_cdf(self.confidence) * np.sqrt(max(weights @ covariance @ weights, 0.0))
+            if value_at_risk * scale > self.var_limit:
+                scale = self.var_limit / value_at_risk
+        return weights * scale
@@ -0,0 +1,224 @@
+from typing import Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ROUND_TRIP_COLUMNS = [
+    'symbol', 'entry_time', 'exit_time', 'quantity', 'entry_price', 'exit_price',
+    'commission', 'pnl', 'return', 'holding_period'
+]
+
+
+def match_round_trips(trade_history: pd.DataFrame,
+                      prices: Union[pd.DataFrame, Dict[str, pd.DataFrame], None] = None) -> pd.DataFrame:
+    """
+    Pair BUY and SELL fills into round trips, first in first out.
+
+    Every fill of a symbol is laid out on a line of cumulative quantity, buys and
+    sells separately. FIFO matching then amounts to intersecting the buy and sell
+    intervals, which is done for all symbols at once with sorted array searches.
+    A buy closed by several sells gives one round trip per sell. The ledger must
+    be long-only, with sells never exceeding the open position, as enforced by
+    Portfolio. Quantity that is still open is not reported.
+
+    Args:
+        trade_history (pd.DataFrame): Fills with 'timestamp', 'type', 'price', 'quantity',
+            'commission' and optionally 'symbol' columns, in execution order
+        prices (Union[pd.DataFrame, Dict[str, pd.DataFrame], None]): OHLC data with 'High'
+            and 'Low' columns, or a dict of it per symbol, used for MAE and MFE
+
+    Returns:
+        pd.DataFrame: One row per round trip with P&L, return, holding period and, when
+            prices are given, 'mae' and 'mfe' as returns relative to the entry price
+    """
+    if trade_history.empty:
+        return pd.DataFrame(columns=ROUND_TRIP_COLUMNS)
+
+    if 'symbol' in trade_history.columns:
+        symbols = trade_history['symbol'].fillna('').to_numpy()
+    else:
+        symbols = np.full(len(trade_history), '', dtype=object)
+    codes, names = pd.factorize(symbols)
+
+    is_buy = (trade_history['type'] == 'BUY').to_numpy()
+    quantity = trade_history['quantity'].to_numpy(dtype='float64')
+    n_groups = len(names)
+
+    # Stable sort by symbol keeps the execution order within each symbol
+    buy_rows = np.flatnonzero(is_buy)
+    sell_rows = np.flatnonzero(~is_buy)
+    buy_rows = buy_rows[np.argsort(codes[buy_rows], kind='stable')]
+    sell_rows = sell_rows[np.argsort(codes[sell_rows], kind='stable')]
+
+    buy_total = np.bincount(codes[buy_rows], weights=quantity[buy_rows], minlength=n_groups)
+    sell_total = np.bincount(codes[sell_rows], weights=quantity[sell_rows], minlength=n_groups)
+
+    # Give each symbol its own stretch of the quantity line, long enough for both sides
+    span = np.maximum(buy_total, sell_total)
+    base = np.cumsum(span) - span
+
+    def intervals(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ends = np.cumsum(quantity[rows])
+        group_start = np.cumsum(np.bincount(codes[rows], minlength=n_groups)) - np.bincount(codes[rows], minlength=n_groups)
+        offset = np.concatenate([[0.0], ends])[group_start][codes[rows]]
+        ends = ends - offset + base[codes[rows]]
+        return ends - quantity[rows], ends
+
+    buy_start, buy_end = intervals(buy_rows)
+    sell_start, sell_end = intervals(sell_rows)
+
+    points = np.unique(np.concatenate([buy_start, buy_end, sell_start, sell_end]))
+    lots = np.diff(points)
+    mids = points[:-1] + lots / 2
+
+    buy_index = np.searchsorted(buy_end, mids, side='left')
+    sell_index = np.searchsorted(sell_end, mids, side='left')
+    buy_index_safe = np.minimum(buy_index, len(buy_rows) - 1)
+    sell_index_safe = np.minimum(sell_index, len(sell_rows) - 1)
+
+    # Rounding in the cumulative sums leaves slivers where a sell closes the position
+    tolerance = 1e-9 * max(1.0, float(quantity.max()))
+    matched = (
+        (buy_index < len(buy_rows)) & (sell_index < len(sell_rows)) &
+        (buy_start[buy_index_safe] < mids) & (sell_start[sell_index_safe] < mids) &
+        (lots > tolerance)
+    )
+    if len(buy_rows) == 0 or len(sell_rows) == 0 or not matched.any():
+        return pd.DataFrame(columns=ROUND_TRIP_COLUMNS)
+
+    entry = buy_rows[buy_index[matched]]
+    exit_ = sell_rows[sell_index[matched]]
+    lot = lots[matched]
+
+    price = trade_history['price'].to_numpy(dtype='float64')
+    commission = trade_history['commission'].to_numpy(dtype='float64')
+    timestamp = pd.to_datetime(trade_history['timestamp']).to_numpy()
+
+    lot_commission = commission[entry] * lot / quantity[entry] + commission[exit_] * lot / quantity[exit_]
+    pnl = lot * (price[exit_] - price[entry]) - lot_commission
+
+    round_trips = pd.DataFrame({
+        'symbol': names[codes[entry]],
+        'entry_time': timestamp[entry],
+        'exit_time': timestamp[exit_],
+        'quantity': lot,
+        'entry_price': price[entry],
+        'exit_price': price[exit_],
+        'commission': lot_commission,
+        'pnl': pnl,
+        'return': pnl / (lot * price[entry]),
+        'holding_period': timestamp[exit_] - timestamp[entry]
+    })
+
+    if prices is not None:
+        round_trips['mae'], round_trips['mfe'] = _excursions(round_trips, prices)
+
+    return round_trips
+
+
+def _excursions(round_trips: pd.DataFrame,
+                prices: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the maximum adverse and favourable excursions of each round trip."""
+    mae = np.full(len(round_trips), np.nan)
+    mfe = np.full(len(round_trips), np.nan)
+
+    if isinstance(prices, pd.DataFrame):
+        groups = {None: (np.arange(len(round_trips)), prices)}
+    else:
+        groups = {}
+        for symbol, rows in round_trips.groupby('symbol').indices.items():
+            if symbol in prices:
+                groups[symbol] = (rows, prices[symbol])
+
+    for rows, frame in groups.values():
+        index = frame.index.to_numpy()
+        start = np.searchsorted(index, round_trips['entry_time'].to_numpy()[rows], side='left')
+        stop = np.searchsorted(index, round_trips['exit_time'].to_numpy()[rows], side='right')
+        valid = stop > start
+        rows, start, stop = rows[valid], start[valid], stop[valid]
+        if len(rows) == 0:
+            continue
+
+        lowest = _range_reduce(frame['Low'].to_numpy(dtype='float64'), start, stop, np.fmin)
+        highest = _range_reduce(frame['High'].to_numpy(dtype='float64'), start, stop, np.fmax)
+
+        entry_price = round_trips['entry_price'].to_numpy()[rows]
+        mae[rows] = lowest / entry_price - 1
+        mfe[rows] = highest / entry_price - 1
+
+    return mae, mfe
+
+
+def _range_reduce(values: np.ndarray, start: np.ndarray, stop: np.ndarray,
+                  func: np.ufunc) -> np.ndarray:
+    """
+    Reduce values over many [start, stop) ranges with a sparse table.
+
+    Level k of the table holds func over every window of 2**k values, so any
+    range is covered by two overlapping windows of the same level. Cost does
+    not depend on the range lengths.
+    """
+    lengths = stop - start
+    levels = np.floor(np.log2(lengths)).astype(int)
+    result = np.empty(len(start))
+
+    table = values
+    for level in range(levels.max() + 1):
+        if level > 0:
+            half = 1 << (level - 1)
+            table = func(table[:-half], table[half:])
+        selected = levels == level
+        if selected.any():
+            result[selected] = func(table[start[selected]], table[stop[selected] - (1 << level)])
+    return result
+
+
+def calculate_profit_factor(round_trips: pd.DataFrame) -> float:
+    """
+    Calculate the profit factor of a set of round trips.
+
+    Args:
+        round_trips (pd.DataFrame): Round trips with a 'pnl' column
+
+    Returns:
+        float: Gross profit divided by gross loss (inf when there are no losses)
+    """
+    if round_trips.empty:
+        return float('nan')
+    pnl = round_trips['pnl'].to_numpy()
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
+    if gross_loss == 0:
+        return float('inf') if gross_profit > 0 else float('nan')
+    return gross_profit / gross_loss
+
+
+def generate_trade_report(round_trips: pd.DataFrame) -> Dict[str, float]:
+    """
+    Summarize trade-level performance.
+
+    Args:
+        round_trips (pd.DataFrame): Round trips from match_round_trips
+
+    Returns:
+        dict: Dictionary containing trade-level metrics
+    """
+    if round_trips.empty:
+        return {'Round Trips': 0}
+
+    pnl = round_trips['pnl']
+    report = {
+        'Round Trips': len(round_trips),
+        'Win Rate': (pnl > 0).mean(),
+        'Profit Factor': calculate_profit_factor(round_trips),
+        'Total P&L': pnl.sum(),
+        'Average P&L': pnl.mean(),
+        'Average Win': pnl[pnl > 0].mean(),
+        'Average Loss': pnl[pnl < 0].mean(),
+        'Average Holding Period': round_trips['holding_period'].mean()
+    }
+    if 'mae' in round_trips.columns:
+        report['Average MAE'] = round_trips['mae'].mean()
+        report['Average MFE'] = round_trips['mfe'].mean()
+
+    return report
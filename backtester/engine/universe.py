@@ -0,0 +1,187 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+import pandas as pd
+
+from backtester.engine.backtest import Backtest
+from backtester.engine.metrics import generate_performance_report
+from backtester.strategies.base_strategy import BaseStrategy
+from backtester.utils.data_loader import DataLoader
+
+
+def run_symbol_backtest(data_dir: Union[str, Path], filename: str,
+                        strategy_class: Type[BaseStrategy], parameters: Dict[str, Any],
+                        initial_cash: float = 100000.0,
+                        commission: float = 0.001) -> Dict[str, Any]:
+    """
+    Load one symbol's data, run a backtest on it and summarize the result.
+
+    The data is loaded inside the calling process, so only the file name
+    and the strategy parameters need to be sent to a worker.
+
+    Args:
+        data_dir (Union[str, Path]): Path to the data directory
+        filename (str): Name of the CSV file in the raw directory
+        strategy_class (Type[BaseStrategy]): Strategy class to instantiate
+        parameters (Dict[str, Any]): Strategy parameters
+        initial_cash (float): Initial portfolio cash
+        commission (float): Commission rate per trade
+
+    Returns:
+        Dict[str, Any]: Performance metrics and run statistics for the symbol
+    """
+    start = time.perf_counter()
+    data = DataLoader(data_dir).load_csv(filename)
+
+    strategy = strategy_class(parameters)
+    if not strategy.validate_parameters():
+        raise ValueError(f"Invalid parameters for {strategy_class.__name__}")
+
+    backtest = Backtest(data=data, strategy=strategy,
+                        initial_cash=initial_cash, commission=commission)
+    results = backtest.run()
+
+    equity_curve = results['equity_curve']
+    if equity_curve.empty:
+        report = {}
+    else:
+        report = generate_performance_report(equity_curve['total_equity'],
+                                             results['trade_history'])
+
+    return {
+        'symbol': Path(filename).stem,
+        'bars': len(data),
+        **report,
+        'final_equity': results['final_equity'],
+        'total_trades': results['total_trades'],
+        'elapsed': time.perf_counter() - start
+    }
+
+
+class UniverseRunner:
+    def __init__(self, data_dir: Union[str, Path], strategy_class: Type[BaseStrategy],
+                 parameters: Dict[str, Any], initial_cash: float = 100000.0,
+                 commission: float = 0.001, max_workers: Optional[int] = None):
+        """
+        Initialize a runner that backtests one strategy on every symbol of a universe.
+
+        Each symbol is an independent job scheduled on a process pool. Workers
+        load their own CSV file, so only the file name travels to the worker and
+        only the metrics row travels back.
+
+        Args:
+            data_dir (Union[str, Path]): Path to the data directory
+            strategy_class (Type[BaseStrategy]): Strategy class to run on each symbol
+            parameters (Dict[str, Any]): Strategy parameters shared by all symbols
+            initial_cash (float): Initial portfolio cash per symbol
+            commission (float): Commission rate per trade
+            max_workers (Optional[int]): Number of worker processes (default: CPU count)
+        """
+        self.data_loader = DataLoader(data_dir)
+        self.data_dir = self.data_loader.data_dir
+        self.strategy_class = strategy_class
+        self.parameters = parameters
+        self.initial_cash = initial_cash
+        self.commission = commission
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.failures: Dict[str, str] = {}
+        self.results = None
+
+    def discover(self, symbols: Optional[List[str]] = None, pattern: str = '*.csv') -> List[Path]:
+        """
+        Find the data files of the universe, largest first.
+
+        Scheduling the largest files first keeps a few long jobs from being
+        left running on their own at the end of the batch.
+
+        Args:
+            symbols (Optional[List[str]]): Symbols to include (default: every file matching pattern)
+            pattern (str): Glob pattern used when no symbols are given
+
+        Returns:
+            List[Path]: Data files sorted by size in descending order
+        """
+        if symbols is None:
+            files = list(self.data_loader.raw_dir.glob(pattern))
+        else:
+            files = [self.data_loader.raw_dir / f"{symbol}.csv" for symbol in symbols]
+            missing = [f.name for f in files if not f.exists()]
+            if missing:
+                raise FileNotFoundError(f"Data files not found: {missing}")
+
+        return sorted(files, key=lambda f: f.stat().st_size, reverse=True)
+
+    def run(self, symbols: Optional[List[str]] = None,
+            progress: Optional[Callable[[int, int, str, Optional[str]], None]] = None) -> pd.DataFrame:
+        """
+        Run the strategy on every symbol and aggregate the metrics.
+
+        Results are collected as the jobs finish. A failing symbol is recorded
+        in ``failures`` and does not stop the rest of the batch.
+
+        Args:
+            symbols (Optional[List[str]]): Symbols to run (default: every CSV in the raw directory)
+            progress (Optional[Callable]): Called as progress(done, total, symbol, error)
+                after each job, with error None on success
+
+        Returns:
+            pd.DataFrame: One row of metrics per successful symbol, indexed by symbol
+        """
+        files = self.discover(symbols)
+        total = len(files)
+        rows = []
+        self.failures = {}
+
+        def collect(symbol: str, row: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+            if error is None:
+                rows.append(row)
+            else:
+                self.failures[symbol] = error
+                print(f"Backtest failed for {symbol}: {error}")
+            if progress is not None:
+                progress(len(rows) + len(self.failures), total, symbol, error)
+
+        args = (self.strategy_class, self.parameters, self.initial_cash, self.commission)
+
+        if self.max_workers == 1:
+            for file in files:
+                try:
+                    row = run_symbol_backtest(self.data_dir, file.name, *args)
+                except Exception as e:
+                    collect(file.stem, None, str(e))
+                else:
+                    collect(file.stem, row, None)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(run_symbol_backtest, self.data_dir, file.name, *args): file.stem
+                    for file in files
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        collect(symbol, None, str(e))
+                    else:
+                        collect(symbol, row, None)
+
+        if rows:
+            self.results = pd.DataFrame(rows).set_index('symbol').sort_index()
+        else:
+            self.results = pd.DataFrame()
+        return self.results
+
+    def get_results(self) -> pd.DataFrame:
+        """
+        Get the aggregated metrics table.
+
+        Returns:
+            pd.DataFrame: Metrics per symbol
+        """
+        if self.results is None:
+            raise ValueError("Universe has not been run yet")
+        return self.results
@@ -1,3 +1,35 @@
 """
 Trading strategy implementations
-""" 
\ No newline at end of file
+"""
+from typing import Dict, Type
+
+from .base_strategy import BaseStrategy
+from .bollinger_bands import BollingerBandsStrategy
+from .ml_strategy import MLStrategy
+from .moving_average import MovingAverageCrossover
+from .pairs_trading import PairsTradingStrategy
+from .rsi_strategy import RSIStrategy
+
+# Single-symbol strategies by the names used in configuration files. PairsTradingStrategy
+# takes two symbols' closes and emits a signal per leg, so it cannot run from a config.
+STRATEGIES: Dict[str, Type[BaseStrategy]] = {
+    'MovingAverageCrossover': MovingAverageCrossover,
+    'RSIStrategy': RSIStrategy,
+    'BollingerBandsStrategy': BollingerBandsStrategy,
+    'MLStrategy': MLStrategy,
+}
+
+
+def get_strategy_class(name: str) -> Type[BaseStrategy]:
+    """
+    Look up a strategy class by name.
+
+    Args:
+        name (str): Strategy class name, e.g. 'RSIStrategy'
+
+    Returns:
+        Type[BaseStrategy]: The strategy class
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name}. Available: {list(STRATEGIES)}")
+    return STRATEGIES[name]
\ No newline at end of file
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional
 
+from backtester.utils.dtypes import get_dtype_policy
+
 class BaseStrategy(ABC):
     """
     Abstract base class for all trading strategies.
@@ -13,9 +16,12 @@ class BaseStrategy(ABC):
         Initialize the strategy with its parameters.
         
         Args:
-            parameters (Dict[str, Any]): Dictionary of strategy parameters
+            parameters (Dict[str, Any]): Dictionary of strategy parameters. The optional
+                'dtype_policy' entry ('standard' or 'compact') sets the dtypes of the
+                indicator and signal columns.
         """
         self.parameters = parameters
+        self.dtype_policy = get_dtype_policy(parameters.get('dtype_policy'))
         self.position = 0  # Current position (1 for long, -1 for short, 0 for no position)
         self.signals = None  # Will store the generated signals
         
@@ -58,4 +64,58 @@ class BaseStrategy(ABC):
         Args:
             signal (int): Trading signal (1 for buy, -1 for sell, 0 for hold)
         """
-        self.position = signal 
\ No newline at end of file
+        self.position = signal
+    
+    def get_warmup_period(self) -> Optional[int]:
+        """
+        Get the number of trailing bars needed to recompute the latest signals.
+        
+        Generating signals on this many bars of history followed by new bars gives
+        the same signals for the new bars as generating them on the full history.
+        
+        Returns:
+            Optional[int]: Number of warm-up bars, or None if the strategy cannot resume
+        """
+        return None
+    
+    def calculate_position_size(self, price: float, portfolio_value: float,
+                              risk_per_trade: float = 0.02) -> float:
+        """
+        Calculate the position size based on portfolio value and risk per trade.
+        
+        Args:
+            price (float): Current price
+            portfolio_value (float): Current portfolio value
+            risk_per_trade (float): Maximum risk per trade as a fraction of portfolio
+        
+        Returns:
+            float: Number of shares to trade
+        """
+        position_value = portfolio_value * risk_per_trade
+        return position_value / price
+    
+    def as_indicator(self, values: pd.Series) -> pd.Series:
+        """
+        Cast an indicator series to the dtype of the strategy's dtype policy.
+        
+        Args:
+            values (pd.Series): Indicator values
+            
+        Returns:
+            pd.Series: Indicator values in the policy dtype
+        """
+        if self.dtype_policy.indicator is None:
+            return values
+        return values.astype(self.dtype_policy.indicator, copy=False)
+    
+    def empty_signal(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Create a hold (0) signal column in the dtype of the strategy's dtype policy.
+        
+        Args:
+            data (pd.DataFrame): OHLCV data the signal is generated for
+            
+        Returns:
+            np.ndarray: Array of zeros with one entry per row
+        """
+        return np.zeros(len(data), dtype=self.dtype_policy.signal or 'int64')
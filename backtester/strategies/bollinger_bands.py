@@ -34,6 +34,15 @@ class BollingerBandsStrategy(BaseStrategy):
             return False
         return True
         
+    def get_warmup_period(self) -> int:
+        """
+        Get the number of trailing bars needed to recompute the latest signals.
+        
+        Returns:
+            int: Band period (also used for the volume average) plus one bar for the signal change
+        """
+        return self.period + 1
+        
     def calculate_bollinger_bands(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate Bollinger Bands for the given data.
@@ -44,12 +53,12 @@ class BollingerBandsStrategy(BaseStrategy):
         Returns:
             pd.DataFrame: DataFrame with Bollinger Bands added
         """
-        data = data.copy()  # Avoid SettingWithCopyWarning
+        data = data.copy(deep=False)  # New columns stay off the caller's frame; prices are shared
         # Calculate middle band (SMA)
-        data['Middle_Band'] = data['Close'].rolling(window=self.period).mean()
+        data['Middle_Band'] = self.as_indicator(data['Close'].rolling(window=self.period).mean())
         
         # Calculate standard deviation
-        data['Std_Dev'] = data['Close'].rolling(window=self.period).std()
+        data['Std_Dev'] = self.as_indicator(data['Close'].rolling(window=self.period).std())
         
         # Calculate upper and lower bands
         data['Upper_Band'] = data['Middle_Band'] + (data['Std_Dev'] * self.std_dev)
@@ -75,7 +84,7 @@ class BollingerBandsStrategy(BaseStrategy):
         data = self.calculate_bollinger_bands(data)
         
         # Initialize signals
-        data['Signal'] = 0
+        data['Signal'] = self.empty_signal(data)
         
         # Generate signals based on price touching bands
         data.loc[data['Close'] <= data['Lower_Band'], 'Signal'] = 1  # Buy signal
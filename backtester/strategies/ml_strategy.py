@@ -0,0 +1,259 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .base_strategy import BaseStrategy
+from .bollinger_bands import BollingerBandsStrategy
+from .rsi_strategy import RSIStrategy
+
+# Training data shared with the worker processes, set once per worker by _init_worker
+_worker_data: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def _init_worker(features: np.ndarray, labels: np.ndarray) -> None:
+    """Store the feature matrix and labels in a worker process."""
+    global _worker_data
+    _worker_data = (features, labels)
+
+
+def _fit_predict_segment(model: Any, segment: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Fit a copy of the model on one training window and predict its segment.
+    
+    Args:
+        model (Any): Unfitted scikit-learn classifier used as a template
+        segment (Tuple[int, int, int, int]): Training start and end, prediction start and end rows
+    
+    Returns:
+        np.ndarray: Probability of an up move for each row of the segment (NaN where unknown)
+    """
+    # scikit-learn is only imported by processes that actually train a model
+    from sklearn import config_context
+    from sklearn.base import clone
+    
+    features, labels = _worker_data
+    train_start, train_end, predict_start, predict_end = segment
+    probabilities = np.full(predict_end - predict_start, np.nan)
+    
+    X, y = features[train_start:train_end], labels[train_start:train_end]
+    usable = np.isfinite(X).all(axis=1) & np.isfinite(y)
+    X, y = X[usable], y[usable]
+    if len(y) == 0 or len(np.unique(y)) < 2:
+        return probabilities
+    
+    X_predict = features[predict_start:predict_end]
+    predictable = np.isfinite(X_predict).all(axis=1)
+    
+    # Rows are already filtered to finite values, so skip scikit-learn's own checks
+    with config_context(assume_finite=True):
+        fitted = clone(model).fit(X, y)
+        if predictable.any():
+            up = list(fitted.classes_).index(1)
+            probabilities[predictable] = fitted.predict_proba(X_predict[predictable])[:, up]
+    return probabilities
+
+
+class MLStrategy(BaseStrategy):
+    def __init__(self, parameters: Dict[str, Any]):
+        """
+        Initialize the machine learning strategy.
+        
+        A classifier predicts whether the close will be higher after `horizon`
+        bars. It is retrained every `retrain_every` bars on the most recent
+        `train_window` bars (or on all past bars when `expanding`), using only
+        labels already known at that point. The training windows are fitted in
+        parallel and each model predicts its whole segment in one call.
+        Subclasses can override build_features, build_labels and make_model.
+        
+        Args:
+            parameters (Dict[str, Any]): Dictionary containing:
+                - sma_windows (List[int]): Windows of the price-to-SMA features (default: [10, 20, 50])
+                - rsi_period (int): RSI period (default: 14)
+                - bb_period (int): Bollinger Bands period (default: 20)
+                - bb_std (float): Bollinger Bands standard deviations (default: 2.0)
+                - horizon (int): Number of bars ahead the label looks (default: 1)
+                - train_window (int): Number of bars in each training window (default: 252)
+                - expanding (bool): Train on all past bars instead of a rolling window (default: False)
+                - retrain_every (int): Number of bars between retrainings (default: 21)
+                - threshold (float): Up probability needed to go long; short below 1 - threshold
+                  (default: 0.55)
+                - model: Unfitted scikit-learn classifier (default: scaled logistic regression)
+                - n_jobs (int): Number of processes fitting models (default: 1)
+        """
+        super().__init__(parameters)
+        self.sma_windows = parameters.get('sma_windows', [10, 20, 50])
+        self.rsi_period = parameters.get('rsi_period', 14)
+        self.bb_period = parameters.get('bb_period', 20)
+        self.bb_std = parameters.get('bb_std', 2.0)
+        self.horizon = parameters.get('horizon', 1)
+        self.train_window = parameters.get('train_window', 252)
+        self.expanding = parameters.get('expanding', False)
+        self.retrain_every = parameters.get('retrain_every', 21)
+        self.threshold = parameters.get('threshold', 0.55)
+        self.model = parameters.get('model')
+        self.n_jobs = parameters.get('n_jobs', 1)
+        
+    def validate_parameters(self) -> bool:
+        """
+        Validate the strategy parameters.
+        
+        Returns:
+            bool: True if parameters are valid, False otherwise
+        """
+        if not self.sma_windows or not all(isinstance(w, int) and w > 0 for w in self.sma_windows):
+            return False
+        for value in [self.rsi_period, self.bb_period, self.horizon, self.train_window, self.retrain_every, self.n_jobs]:
+            if not isinstance(value, int) or value <= 0:
+                return False
+        if not isinstance(self.bb_std, (int, float)) or self.bb_std <= 0:
+            return False
+        if not isinstance(self.expanding, bool):
+            return False
+        if not isinstance(self.threshold, (int, float)) or not 0.5 <= self.threshold < 1:
+            return False
+        return True
+        
+    def make_model(self) -> Any:
+        """
+        Create the unfitted classifier trained on each window.
+        
+        Returns:
+            Any: scikit-learn classifier with predict_proba
+        """
+        if self.model is not None:
+            return self.model
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+        
+    def build_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the feature matrix from the indicator code of the other strategies.
+        
+        Every feature at a bar only uses that bar and earlier ones.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with OHLCV data
+        
+        Returns:
+            pd.DataFrame: One row of features per bar
+        """
+        close = data['Close']
+        features = {
+            f"SMA_{window}_Ratio": self.as_indicator(close / close.rolling(window=window).mean() - 1)
+            for window in self.sma_windows
+        }
+        features['RSI'] = RSIStrategy({**self.parameters, 'period': self.rsi_period}).calculate_rsi(data) / 100
+        
+        bands = BollingerBandsStrategy({**self.parameters, 'period': self.bb_period, 'std_dev': self.bb_std})
+        bands = bands.calculate_bollinger_bands(data[['Close']])
+        features['Percent_B'] = bands['Percent_B']
+        features['Bandwidth'] = bands['Bandwidth']
+        
+        return pd.DataFrame(features, index=data.index)
+        
+    def build_labels(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Label each bar with whether the close rises over the next `horizon` bars.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with OHLCV data
+        
+        Returns:
+            pd.Series: 1.0 for a rise, 0.0 otherwise and NaN for the last `horizon` bars,
+                whose future close is unknown
+        """
+        close = data['Close']
+        future = close.shift(-self.horizon)
+        return (future > close).astype('float64').where(future.notna())
+        
+    def training_schedule(self, features: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Plan the training windows and the segments their models predict.
+        
+        The model predicting a segment is trained only on bars whose label was
+        known at the bar before the segment starts.
+        
+        Args:
+            features (np.ndarray): Feature matrix
+        
+        Returns:
+            List[Tuple[int, int, int, int]]: Training start and end, prediction start and end rows
+        """
+        complete = np.flatnonzero(np.isfinite(features).all(axis=1))
+        if len(complete) == 0:
+            return []
+        first = complete[0]
+        
+        segments = []
+        for predict_start in range(first + self.train_window + self.horizon, len(features), self.retrain_every):
+            train_end = predict_start - self.horizon
+            train_start = first if self.expanding else train_end - self.train_window
+            segments.append((train_start, train_end, predict_start, min(predict_start + self.retrain_every, len(features))))
+        return segments
+        
+    def predict_probabilities(self, features: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """
+        Train the models of the schedule and predict the probability of an up move.
+        
+        Args:
+            features (np.ndarray): Feature matrix
+            labels (np.ndarray): Label of each row (NaN where unknown)
+        
+        Returns:
+            np.ndarray: Up probability for each row (NaN before the first model)
+        """
+        probabilities = np.full(len(features), np.nan)
+        segments = self.training_schedule(features)
+        if not segments:
+            return probabilities
+        
+        model = self.make_model()
+        if self.n_jobs == 1:
+            _init_worker(features, labels)
+            predictions = [_fit_predict_segment(model, segment) for segment in segments]
+        else:
+            workers = min(self.n_jobs, os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(features, labels)) as executor:
+                chunksize = max(1, len(segments) // (4 * workers))
+                predictions = list(executor.map(_fit_predict_segment, [model] * len(segments), segments,
+                                                chunksize=chunksize))
+        
+        for (_, _, predict_start, predict_end), segment_probabilities in zip(segments, predictions):
+            probabilities[predict_start:predict_end] = segment_probabilities
+        return probabilities
+        
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate trading signals from the model predictions.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with OHLCV data
+        
+        Returns:
+            pd.DataFrame: DataFrame with signals (1 for buy, -1 for sell, 0 for hold)
+        """
+        features = self.build_features(data)
+        labels = self.build_labels(data)
+        
+        probabilities = self.predict_probabilities(features.to_numpy(dtype='float64'),
+                                                   labels.to_numpy(dtype='float64'))
+        
+        for name in features.columns:
+            data[name] = features[name]
+        data['Probability'] = self.as_indicator(pd.Series(probabilities, index=data.index))
+        
+        # Generate signals
+        data['Signal'] = self.empty_signal(data)
+        data.loc[data['Probability'] >= self.threshold, 'Signal'] = 1  # Buy signal
+        data.loc[data['Probability'] <= 1 - self.threshold, 'Signal'] = -1  # Sell signal
+        
+        # Generate actual trading signals (only when signal changes)
+        data['Position'] = data['Signal'].diff()
+        
+        return data
\ No newline at end of file
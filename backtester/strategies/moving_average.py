@@ -32,6 +32,15 @@ class MovingAverageCrossover(BaseStrategy):
             return False
         return True
         
+    def get_warmup_period(self) -> int:
+        """
+        Get the number of trailing bars needed to recompute the latest signals.
+        
+        Returns:
+            int: Long moving average window plus one bar for the signal change
+        """
+        return self.long_window + 1
+        
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Generate trading signals based on moving average crossover.
@@ -43,31 +52,15 @@ class MovingAverageCrossover(BaseStrategy):
             pd.DataFrame: DataFrame with signals (1 for buy, -1 for sell, 0 for hold)
         """
         # Calculate moving averages
-        data['SMA_short'] = data['Close'].rolling(window=self.short_window).mean()
-        data['SMA_long'] = data['Close'].rolling(window=self.long_window).mean()
+        data['SMA_short'] = self.as_indicator(data['Close'].rolling(window=self.short_window).mean())
+        data['SMA_long'] = self.as_indicator(data['Close'].rolling(window=self.long_window).mean())
         
         # Generate signals
-        data['Signal'] = 0
+        data['Signal'] = self.empty_signal(data)
         data.loc[data['SMA_short'] > data['SMA_long'], 'Signal'] = 1  # Buy signal
         data.loc[data['SMA_short'] < data['SMA_long'], 'Signal'] = -1  # Sell signal
         
         # Generate actual trading signals (only when signal changes)
         data['Position'] = data['Signal'].diff()
         
-        return data
-    
-    def calculate_position_size(self, price: float, portfolio_value: float, 
-                              risk_per_trade: float = 0.02) -> float:
-        """
-        Calculate the position size based on portfolio value and risk per trade.
-        
-        Args:
-            price (float): Current price
-            portfolio_value (float): Current portfolio value
-            risk_per_trade (float): Maximum risk per trade as a fraction of portfolio
-            
-        Returns:
-            float: Number of shares to trade
-        """
-        position_value = portfolio_value * risk_per_trade
-        return position_value / price 
\ No newline at end of file
+        return data
\ No newline at end of file
@@ -0,0 +1,314 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .base_strategy import BaseStrategy
+
+# Universe data shared with the worker processes, set once per worker by _init_worker
+_worker_state: Optional[Dict[str, Any]] = None
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum each column over a trailing window with two cumulative sums.
+    
+    Args:
+        values (np.ndarray): 2D array with one series per column
+        window (int): Window length
+    
+    Returns:
+        np.ndarray: Window sums, NaN until a window of finite values is complete
+    """
+    valid = np.isfinite(values)
+    zeros = np.zeros((1, values.shape[1]))
+    total = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    count = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+    
+    sums = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        sums[window - 1:] = total[window:] - total[:-window]
+        sums[window - 1:][count[window:] - count[:-window] < window] = np.nan
+    return sums
+
+
+def rolling_moments(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the rolling mean and population variance of each column.
+    
+    Args:
+        values (np.ndarray): 2D array with one series per column, centred near zero
+        window (int): Window length
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Rolling means and variances
+    """
+    mean = rolling_sum(values, window) / window
+    variance = rolling_sum(values * values, window) / window - mean * mean
+    return mean, np.maximum(variance, 0.0)
+
+
+def rolling_regression(x: np.ndarray, y: np.ndarray, window: int,
+                       moments_x: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                       moments_y: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Regress each column of y on the same column of x over a trailing window.
+    
+    Every window statistic comes from running sums, so each bar costs the same
+    whatever the window length, instead of refitting a regression per window.
+    
+    Args:
+        x (np.ndarray): 2D array of regressors, centred near zero
+        y (np.ndarray): 2D array of dependent series, centred near zero
+        window (int): Window length
+        moments_x (Optional[Tuple]): Precomputed rolling moments of x
+        moments_y (Optional[Tuple]): Precomputed rolling moments of y
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Hedge ratio, residual of the
+            current bar and residual standard deviation of each window
+    """
+    mean_x, var_x = moments_x if moments_x is not None else rolling_moments(x, window)
+    mean_y, var_y = moments_y if moments_y is not None else rolling_moments(y, window)
+    covariance = rolling_sum(x * y, window) / window - mean_x * mean_y
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = covariance / var_x
+        residual = (y - mean_y) - beta * (x - mean_x)
+        residual_std = np.sqrt(np.maximum(var_y - beta * covariance, 0.0))
+    return beta, residual, residual_std
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    """Store the universe arrays in a worker process."""
+    global _worker_state
+    _worker_state = state
+
+
+def _scan_chunk(start: int, stop: int) -> Dict[str, np.ndarray]:
+    """
+    Compute the screening statistics of a range of pairs.
+    
+    Args:
+        start (int): First pair number
+        stop (int): Pair number after the last one
+    
+    Returns:
+        Dict[str, np.ndarray]: Statistics of each pair of the range
+    """
+    state = _worker_state
+    a, b = state['first'][start:stop], state['second'][start:stop]
+    mean, variance, prices = state['mean'], state['variance'], state['prices']
+    
+    beta, residual, residual_std = rolling_regression(
+        prices[:, b], prices[:, a], state['window'],
+        moments_x=(mean[:, b], variance[:, b]), moments_y=(mean[:, a], variance[:, a])
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore = residual / residual_std
+    zscore[~np.isfinite(zscore)] = np.nan
+    
+    returns = state['returns']
+    correlation = np.einsum('ij,ij->j', returns[:, a], returns[:, b]) / len(returns)
+    
+    # Mean reversion of the z-score as an AR(1) coefficient
+    previous, current = zscore[:-1], zscore[1:]
+    both = np.isfinite(previous) & np.isfinite(current)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi = np.where(both, previous * current, 0.0).sum(axis=0) / np.where(both, previous * previous, 0.0).sum(axis=0)
+        half_life = np.where((phi > 0) & (phi < 1), -np.log(2) / np.log(phi), np.inf)
+    
+    above = np.abs(zscore) > state['entry_z']
+    entries = (above[1:] & ~above[:-1]).sum(axis=0)
+    
+    last = np.isfinite(zscore[-1])
+    return {
+        'first': a,
+        'second': b,
+        'correlation': correlation,
+        'hedge_ratio': np.where(last, beta[-1], np.nan),
+        'zscore': zscore[-1],
+        'half_life': half_life,
+        'entries': entries
+    }
+
+
+class PairsTradingStrategy(BaseStrategy):
+    def __init__(self, parameters: Dict[str, Any]):
+        """
+        Initialize the pairs trading strategy.
+        
+        The price of A is regressed on the price of B over a rolling window.
+        The spread is the residual of the current bar, in standard deviations
+        of the window's residuals. The spread is bought (long A, short B) when
+        its z-score falls below -entry_z, sold when it rises above entry_z, and
+        closed once it is back within exit_z.
+        
+        The signals are for a two-leg book that can short, which the
+        single-symbol, long-only Backtest is not. Execute them with a broker or
+        a portfolio that can short: hold Signal_A units of A's notional in A and
+        Signal_B times Hedge_Ratio of it in B, and trade on Position_A and
+        Position_B changes. For the same reason the strategy is not in the
+        STRATEGIES registry used by sweeps and universe runs.
+        
+        Args:
+            parameters (Dict[str, Any]): Dictionary containing:
+                - window (int): Rolling regression window (default: 60)
+                - entry_z (float): Z-score that opens a position (default: 2.0)
+                - exit_z (float): Z-score that closes it (default: 0.5)
+                - use_log (bool): Regress log prices instead of prices (default: True)
+        """
+        super().__init__(parameters)
+        self.window = parameters.get('window', 60)
+        self.entry_z = parameters.get('entry_z', 2.0)
+        self.exit_z = parameters.get('exit_z', 0.5)
+        self.use_log = parameters.get('use_log', True)
+        
+    def validate_parameters(self) -> bool:
+        """
+        Validate the strategy parameters.
+        
+        Returns:
+            bool: True if parameters are valid, False otherwise
+        """
+        if not isinstance(self.window, int) or self.window < 3:
+            return False
+        if not isinstance(self.entry_z, (int, float)) or not isinstance(self.exit_z, (int, float)):
+            return False
+        if self.exit_z < 0 or self.entry_z <= self.exit_z:
+            return False
+        if not isinstance(self.use_log, bool):
+            return False
+        return True
+        
+    @staticmethod
+    def pair_frame(data_a: pd.DataFrame, data_b: pd.DataFrame) -> pd.DataFrame:
+        """
+        Align the OHLCV data of two symbols into the input of generate_signals.
+        
+        Args:
+            data_a (pd.DataFrame): OHLCV data of the first symbol
+            data_b (pd.DataFrame): OHLCV data of the second symbol
+        
+        Returns:
+            pd.DataFrame: 'Close_A' and 'Close_B' columns on the common dates
+        """
+        return pd.concat([data_a['Close'].rename('Close_A'), data_b['Close'].rename('Close_B')],
+                         axis=1, join='inner')
+        
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate paired long/short signals on the spread between two symbols.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'Close_A' and 'Close_B' columns, e.g. from pair_frame
+        
+        Returns:
+            pd.DataFrame: DataFrame with 'Hedge_Ratio', 'Spread' and 'ZScore', the spread
+                signal ('Signal', 1 for long A / short B), and per-leg 'Signal_A',
+                'Signal_B', 'Position_A' and 'Position_B' columns
+        """
+        prices = data[['Close_B', 'Close_A']].to_numpy(dtype='float64')
+        if self.use_log:
+            prices = np.log(prices)
+        prices = prices - np.nanmean(prices, axis=0)
+        
+        beta, residual, residual_std = rolling_regression(prices[:, :1], prices[:, 1:], self.window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscore = (residual / residual_std)[:, 0]
+        zscore[~np.isfinite(zscore)] = np.nan
+        
+        data['Hedge_Ratio'] = self.as_indicator(pd.Series(beta[:, 0], index=data.index))
+        data['Spread'] = self.as_indicator(pd.Series(residual[:, 0], index=data.index))
+        data['ZScore'] = self.as_indicator(pd.Series(zscore, index=data.index))
+        
+        # Positions change only on entry and exit events and are held in between
+        events = np.full(len(data), np.nan)
+        events[np.abs(zscore) <= self.exit_z] = 0
+        events[zscore < -self.entry_z] = 1
+        events[zscore > self.entry_z] = -1
+        state = pd.Series(events, index=data.index).ffill().fillna(0).to_numpy()
+        
+        data['Signal'] = self.empty_signal(data)
+        data['Signal'] = state.astype(data['Signal'].dtype)
+        data['Signal_A'] = data['Signal']
+        data['Signal_B'] = -data['Signal']
+        
+        # Generate actual trading signals (only when signal changes)
+        data['Position'] = data['Signal'].diff()
+        data['Position_A'] = data['Position']
+        data['Position_B'] = -data['Position']
+        
+        return data
+        
+    def scan_pairs(self, prices: Union[pd.DataFrame, Dict[str, pd.DataFrame]], top: Optional[int] = None,
+                   min_correlation: Optional[float] = None, chunk_size: int = 1024,
+                   n_jobs: int = 1) -> pd.DataFrame:
+        """
+        Screen every pair of a universe with the strategy's rolling regression.
+        
+        Pairs are processed in chunks of chunk_size columns at a time, and the
+        chunks are spread over n_jobs processes that share the universe's
+        prices and per-symbol rolling moments.
+        
+        Args:
+            prices (Union[pd.DataFrame, Dict[str, pd.DataFrame]]): Close prices with one column
+                per symbol, or OHLCV data by symbol
+            top (Optional[int]): Only return this many pairs with the fastest mean reversion
+            min_correlation (Optional[float]): Only return pairs whose returns are at least this correlated
+            chunk_size (int): Number of pairs evaluated together
+            n_jobs (int): Number of worker processes
+        
+        Returns:
+            pd.DataFrame: One row per pair with 'symbol_a', 'symbol_b', return 'correlation',
+                latest 'hedge_ratio' and 'zscore', spread 'half_life' in bars and number of
+                'entries', sorted by half-life
+        """
+        if isinstance(prices, dict):
+            prices = pd.DataFrame({symbol: frame['Close'] for symbol, frame in prices.items()})
+        symbols = list(prices.columns)
+        
+        values = prices.to_numpy(dtype='float64')
+        if self.use_log:
+            values = np.log(values)
+        values = values - np.nanmean(values, axis=0)
+        
+        returns = np.diff(values, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = (returns - np.nanmean(returns, axis=0)) / np.nanstd(returns, axis=0)
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        
+        mean, variance = rolling_moments(values, self.window)
+        first, second = np.triu_indices(len(symbols), k=1)
+        state = {
+            'prices': values, 'mean': mean, 'variance': variance, 'returns': returns,
+            'first': first, 'second': second, 'window': self.window, 'entry_z': self.entry_z
+        }
+        
+        ranges = [(start, min(start + chunk_size, len(first))) for start in range(0, len(first), chunk_size)]
+        if n_jobs == 1:
+            _init_worker(state)
+            chunks = [_scan_chunk(start, stop) for start, stop in ranges]
+        else:
+            workers = min(n_jobs, os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as executor:
+                chunks = list(executor.map(_scan_chunk, *zip(*ranges))) if ranges else []
+        
+        columns = ['correlation', 'hedge_ratio', 'zscore', 'half_life', 'entries']
+        if not chunks:
+            return pd.DataFrame(columns=['symbol_a', 'symbol_b'] + columns)
+        
+        merged = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+        names = np.array(symbols, dtype=object)
+        results = pd.DataFrame({
+            'symbol_a': names[merged['first']],
+            'symbol_b': names[merged['second']],
+            **{column: merged[column] for column in columns}
+        })
+        
+        if min_correlation is not None:
+            results = results[results['correlation'] >= min_correlation]
+        results = results.sort_values('half_life', kind='stable').reset_index(drop=True)
+        return results if top is None else results.head(top)
\ No newline at end of file
@@ -36,6 +36,15 @@ class RSIStrategy(BaseStrategy):
             return False
         return True
         
+    def get_warmup_period(self) -> int:
+        """
+        Get the number of trailing bars needed to recompute the latest signals.
+        
+        Returns:
+            int: RSI period plus one bar for the price change and one for the signal change
+        """
+        return self.period + 2
+        
     def calculate_rsi(self, data: pd.DataFrame) -> pd.Series:
         """
         Calculate the Relative Strength Index (RSI).
@@ -57,7 +66,7 @@ class RSIStrategy(BaseStrategy):
         rs = gain / loss
         rsi = 100 - (100 / (1 + rs))
         
-        return rsi
+        return self.as_indicator(rsi)
         
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -73,7 +82,7 @@ class RSIStrategy(BaseStrategy):
         data['RSI'] = self.calculate_rsi(data)
         
         # Generate signals
-        data['Signal'] = 0
+        data['Signal'] = self.empty_signal(data)
         data.loc[data['RSI'] < self.oversold, 'Signal'] = 1  # Buy signal
         data.loc[data['RSI'] > self.overbought, 'Signal'] = -1  # Sell signal
         
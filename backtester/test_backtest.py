@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.engine.backtest import Backtest
+from backtester.engine.risk import RiskManager
+from backtester.strategies.bollinger_bands import BollingerBandsStrategy
+from backtester.strategies.moving_average import MovingAverageCrossover
+from backtester.strategies.rsi_strategy import RSIStrategy
+from backtester.utils.synthetic import SyntheticMarket
+
+STRATEGIES = [
+    (MovingAverageCrossover, {'short_window': 10, 'long_window': 30}),
+    (RSIStrategy, {'period': 14, 'overbought': 70, 'oversold': 30}),
+    (BollingerBandsStrategy, {'period': 20, 'std_dev': 2.0}),
+]
+
+
+def assert_same_results(resumed, full):
+    """Compare equity curves and trade histories of two backtests."""
+    assert resumed['total_trades'] == full['total_trades'] > 0
+    pd.testing.assert_index_equal(resumed['equity_curve'].index, full['equity_curve'].index)
+    np.testing.assert_allclose(resumed['equity_curve'].to_numpy(dtype='float64'),
+                               full['equity_curve'].to_numpy(dtype='float64'), rtol=1e-12)
+
+    resumed_trades, full_trades = resumed['trade_history'], full['trade_history']
+    assert resumed_trades['timestamp'].tolist() == full_trades['timestamp'].tolist()
+    assert resumed_trades['type'].tolist() == full_trades['type'].tolist()
+    for column in ['price', 'quantity']:
+        np.testing.assert_allclose(resumed_trades[column].to_numpy(dtype='float64'),
+                                   full_trades[column].to_numpy(dtype='float64'), rtol=1e-12)
+
+
+@pytest.mark.parametrize('strategy_class, parameters', STRATEGIES)
+def test_resume_matches_full_run(tmp_path, strategy_class, parameters):
+    data = SyntheticMarket(seed=11, mu=0.05, sigma=0.3).generate(800)
+    full = Backtest(data.copy(), strategy_class(parameters)).run()
+
+    backtest = Backtest(data.iloc[:300].copy(), strategy_class(parameters))
+    backtest.run()
+    for start in range(300, len(data), 25):
+        path = tmp_path / 'backtest.ckpt'
+        backtest.save_checkpoint(str(path))
+        backtest = Backtest.load_checkpoint(str(path))
+        resumed = backtest.resume(data.iloc[start:start + 25].copy())
+
+    assert_same_results(resumed, full)
+
+
+def test_risk_sized_buys_fit_in_cash_at_leverage_cap(capsys):
+    # A 6% volatility asset targeted at 15% sizes above the 1x cap, so buys use all the equity
+    data = SyntheticMarket(seed=5, mu=0.05, sigma=0.06).generate(600)
+    risk_manager = RiskManager(method='vol_target', estimator='ewma', halflife=20,
+                               target_volatility=0.15)
+    results = Backtest(data, MovingAverageCrossover({'short_window': 10, 'long_window': 30}),
+                       risk_manager=risk_manager).run()
+
+    assert 'Insufficient cash' not in capsys.readouterr().out
+    buys = results['trade_history'].query("type == 'BUY'")
+    assert len(buys) > 0
+    first = buys.iloc[0]
+    assert first['value'] + first['commission'] == pytest.approx(100000.0, rel=1e-6)
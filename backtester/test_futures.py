@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.utils.data_loader import DataLoader
+from backtester.utils.futures import ContinuousContractBuilder
+
+DATES = pd.bdate_range('2019-06-01', '2022-06-30')
+
+
+def make_contract(year, month, seed):
+    """Quarterly contract trading for about 200 days before the 15th of its expiry month."""
+    rng = np.random.default_rng(seed)
+    expiry = pd.Timestamp(year, month, 15)
+    index = DATES[(DATES > expiry - pd.Timedelta(days=200)) & (DATES <= expiry)]
+    close = 100 + rng.normal(0, 1, len(index)).cumsum() + seed
+    volume = np.linspace(100, 10000, len(index)).astype(int)
+    volume[-40:] = np.linspace(10000, 100, 40).astype(int)
+    return pd.DataFrame({'Date': index, 'Open': close, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': volume, 'OpenInterest': volume * 3})
+
+
+CONTRACTS = {
+    f"ES{code}{year}": make_contract(year, month, seed)
+    for seed, (year, code, month) in enumerate(
+        [(2019, 'Z', 12)] + [(year, code, month) for year in (2020, 2021) for code, month in
+                             (('H', 3), ('M', 6), ('U', 9), ('Z', 12))] + [(2022, 'H', 3)]
+    )
+}
+
+
+def write_contracts(directory, names):
+    for name in names:
+        CONTRACTS[name].to_csv(directory / f"{name}.csv", index=False)
+
+
+def assert_same_build(builder):
+    """Compare the series and rolls just built with a full rebuild."""
+    series, rolls = builder.load(), builder.roll_schedule()
+    full = builder.build(force=True)
+    pd.testing.assert_frame_equal(series, full, check_exact=False, rtol=1e-10)
+    pd.testing.assert_frame_equal(rolls, builder.roll_schedule(), check_exact=False, rtol=1e-10)
+
+
+@pytest.mark.parametrize('adjustment', ['ratio', 'difference'])
+def test_incremental_build_with_contract_appended(tmp_path, adjustment):
+    loader = DataLoader(tmp_path)
+    directory = loader.raw_dir / 'ES'
+    directory.mkdir(parents=True)
+    names = list(CONTRACTS)
+
+    write_contracts(directory, names[1:-1])
+    builder = ContinuousContractBuilder(loader, 'ES', adjustment=adjustment)
+    builder.build()
+
+    write_contracts(directory, names[-1:])
+    series = builder.build()
+    assert series['Contract'].iloc[-1] == names[-1]
+    assert_same_build(builder)
+
+
+@pytest.mark.parametrize('adjustment', ['ratio', 'difference'])
+def test_incremental_build_with_contract_inserted_earlier(tmp_path, adjustment):
+    loader = DataLoader(tmp_path)
+    directory = loader.raw_dir / 'ES'
+    directory.mkdir(parents=True)
+    names = list(CONTRACTS)
+
+    write_contracts(directory, names[1:])
+    builder = ContinuousContractBuilder(loader, 'ES', adjustment=adjustment)
+    builder.build()
+
+    write_contracts(directory, names[:1])
+    series = builder.build()
+    assert series['Contract'].iloc[0] == names[0]
+    assert len(builder.roll_schedule()) == len(names) - 1
+    assert_same_build(builder)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.engine.metrics import (
+    calculate_rolling_drawdown,
+    calculate_rolling_sharpe_ratio,
+    calculate_rolling_volatility,
+)
+
+WINDOWS = [2, 5, 63, 500, 1000]
+
+
+def random_returns(n=500, columns=3, seed=0):
+    """Daily returns per column, with a few NaN gaps in the second column."""
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame(rng.normal(0.0005, 0.01, (n, columns)),
+                           index=pd.bdate_range('2020-01-01', periods=n),
+                           columns=[f"curve_{i}" for i in range(columns)])
+    if columns > 1:
+        returns.iloc[[10, 11, 200, 350], 1] = np.nan
+    return returns
+
+
+def naive_rolling_drawdown(values, window):
+    """Drawdown from the running maximum of each window, computed window by window."""
+    result = np.full(values.shape, np.nan)
+    for end in range(window - 1, len(values)):
+        block = values[end - window + 1:end + 1]
+        for column in range(values.shape[1]):
+            finite = block[:, column][~np.isnan(block[:, column])]
+            if len(finite):
+                peak = np.maximum.accumulate(finite)[-1]
+                result[end, column] = (values[end, column] - peak) / peak
+    return result
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_volatility_matches_pandas(window):
+    returns = random_returns()
+    expected = returns.rolling(window).std() * np.sqrt(252)
+    pd.testing.assert_frame_equal(calculate_rolling_volatility(returns, window), expected,
+                                  check_exact=False, rtol=1e-8, atol=1e-12)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_sharpe_matches_pandas(window):
+    returns = random_returns()
+    rolling = returns.rolling(window)
+    expected = np.sqrt(252) * (rolling.mean() - 0.01 / 252) / rolling.std()
+    pd.testing.assert_frame_equal(calculate_rolling_sharpe_ratio(returns, window), expected,
+                                  check_exact=False, rtol=1e-7, atol=1e-10)
+
+
+def test_rolling_moments_with_large_offset():
+    # Equity-like levels with small changes stress cancellation in the running sums
+    values = pd.Series(1e6 + np.random.default_rng(1).normal(0, 1, 2000).cumsum())
+    expected = values.rolling(20).std() * np.sqrt(252)
+    pd.testing.assert_series_equal(calculate_rolling_volatility(values, 20), expected,
+                                   check_exact=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize('window', [1] + WINDOWS)
+def test_rolling_drawdown_matches_naive_running_max(window):
+    equity = (1 + random_returns().fillna(0)).cumprod() * 100000
+    equity.iloc[[30, 31, 32, 300], 0] = np.nan
+    expected = naive_rolling_drawdown(equity.to_numpy(), window)
+    actual = calculate_rolling_drawdown(equity, window)
+    assert isinstance(actual, pd.DataFrame)
+    np.testing.assert_allclose(actual.to_numpy(), expected, rtol=1e-12, atol=1e-15)
+
+
+def test_rolling_metrics_accept_arrays():
+    returns = random_returns(columns=1)['curve_0']
+    np.testing.assert_allclose(calculate_rolling_volatility(returns.to_numpy(), 21),
+                               calculate_rolling_volatility(returns, 21).to_numpy())
+    equity = (1 + returns).cumprod().to_numpy()
+    np.testing.assert_allclose(calculate_rolling_drawdown(equity, 50),
+                               naive_rolling_drawdown(equity.reshape(-1, 1), 50)[:, 0])
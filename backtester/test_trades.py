@@ -0,0 +1,105 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.engine.metrics import calculate_win_rate
+from backtester.engine.trades import match_round_trips
+
+
+def random_ledger(seed, n_fills=400, symbols=('AAA', 'BBB', 'CCC')):
+    """
+    Random long-only fills across symbols: partial buys and sells, sells that close
+    the whole position, and positions reopened after being closed.
+    """
+    rng = np.random.default_rng(seed)
+    held = dict.fromkeys(symbols, 0.0)
+    timestamps = pd.date_range('2020-01-01', periods=n_fills, freq='h')
+    rows = []
+    for timestamp in timestamps:
+        symbol = symbols[rng.integers(len(symbols))]
+        price = float(np.round(rng.uniform(50, 150), 2))
+        if held[symbol] > 0 and rng.random() < 0.5:
+            draw = rng.random()
+            if draw < 0.3:
+                quantity = held[symbol]  # close the position
+            elif draw < 0.4:
+                quantity = float(rng.integers(1, 5))  # whole-share partial fill
+                quantity = min(quantity, held[symbol])
+            else:
+                quantity = held[symbol] * rng.uniform(0.05, 0.95)
+            kind = 'SELL'
+            held[symbol] -= quantity
+        else:
+            quantity = float(np.round(rng.uniform(0.5, 20), 3))
+            kind = 'BUY'
+            held[symbol] += quantity
+        rows.append({'timestamp': timestamp, 'symbol': symbol, 'type': kind, 'price': price,
+                     'quantity': quantity, 'commission': 0.001 * price * quantity})
+    return pd.DataFrame(rows)
+
+
+def naive_round_trips(trade_history):
+    """Reference FIFO matching with a queue of open lots per symbol."""
+    open_lots = {}
+    round_trips = []
+    for fill in trade_history.itertuples(index=False):
+        lots = open_lots.setdefault(fill.symbol, deque())
+        if fill.type == 'BUY':
+            lots.append([fill.quantity, fill])
+            continue
+        remaining = fill.quantity
+        while remaining > 1e-9 and lots:
+            lot = lots[0]
+            size = min(lot[0], remaining)
+            entry = lot[1]
+            commission = entry.commission * size / entry.quantity + fill.commission * size / fill.quantity
+            pnl = size * (fill.price - entry.price) - commission
+            if size > 1e-9:
+                round_trips.append({
+                    'symbol': fill.symbol, 'entry_time': entry.timestamp, 'exit_time': fill.timestamp,
+                    'quantity': size, 'entry_price': entry.price, 'exit_price': fill.price,
+                    'commission': commission, 'pnl': pnl, 'return': pnl / (size * entry.price)
+                })
+            lot[0] -= size
+            remaining -= size
+            if lot[0] <= 1e-9:
+                lots.popleft()
+    return pd.DataFrame(round_trips)
+
+
+def sort_trips(round_trips):
+    return round_trips.sort_values(['symbol', 'exit_time', 'entry_time']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_match_round_trips_matches_naive_fifo(seed):
+    trade_history = random_ledger(seed)
+    expected = sort_trips(naive_round_trips(trade_history))
+    actual = sort_trips(match_round_trips(trade_history))
+
+    assert len(actual) == len(expected)
+    assert actual['symbol'].tolist() == expected['symbol'].tolist()
+    assert (actual['entry_time'] == expected['entry_time']).all()
+    assert (actual['exit_time'] == expected['exit_time']).all()
+    for column in ['quantity', 'entry_price', 'exit_price', 'commission', 'pnl', 'return']:
+        np.testing.assert_allclose(actual[column].to_numpy(dtype='float64'),
+                                   expected[column].to_numpy(dtype='float64'), rtol=1e-9, atol=1e-9)
+
+    assert calculate_win_rate(trade_history) == pytest.approx((expected['pnl'] > 0).mean())
+
+
+def test_excursions_match_naive_range_scan():
+    trade_history = random_ledger(7, symbols=('AAA',))
+    rng = np.random.default_rng(7)
+    index = pd.date_range('2020-01-01', periods=len(trade_history), freq='h')
+    close = 100 + rng.normal(0, 1, len(index)).cumsum()
+    prices = pd.DataFrame({'High': close + rng.uniform(0, 2, len(index)),
+                           'Low': close - rng.uniform(0, 2, len(index))}, index=index)
+
+    round_trips = match_round_trips(trade_history, prices)
+    for trip in round_trips.itertuples(index=False):
+        window = prices.loc[trip.entry_time:trip.exit_time]
+        assert trip.mae == pytest.approx(window['Low'].min() / trip.entry_price - 1)
+        assert trip.mfe == pytest.approx(window['High'].max() / trip.entry_price - 1)
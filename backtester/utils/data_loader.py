@@ -1,16 +1,23 @@
+import io
 import pandas as pd
 from pathlib import Path
-from typing import Union, Optional
+from typing import Dict, Iterator, Tuple, Union, Optional
+
+from backtester.utils.dtypes import DtypePolicy, apply_dtype_policy, get_dtype_policy
 
 class DataLoader:
-    def __init__(self, data_dir: Union[str, Path]):
+    def __init__(self, data_dir: Union[str, Path],
+                 dtype_policy: Union[str, DtypePolicy, None] = None):
         """
         Initialize the DataLoader with the data directory path.
         
         Args:
             data_dir (Union[str, Path]): Path to the data directory
+            dtype_policy (Union[str, DtypePolicy, None]): Column dtypes for loaded data
+                ('standard' or 'compact', default: standard)
         """
         self.data_dir = Path(data_dir)
+        self.dtype_policy = get_dtype_policy(dtype_policy)
         self.raw_dir = self.data_dir / 'raw'
         self.processed_dir = self.data_dir / 'processed'
         
@@ -33,9 +40,92 @@ class DataLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Data file not found: {file_path}")
         
-        # Read the CSV file
-        df = pd.read_csv(file_path)
+        # Read the CSV file, parsing prices straight into the policy dtype
+        df = pd.read_csv(file_path, dtype=self._price_dtypes())
+        
+        return self.prepare_frame(df)
+    
+    def load_appended(self, filename: str, offset: int = 0) -> Tuple[pd.DataFrame, int]:
+        """
+        Load only the rows appended to a CSV file after a byte offset.
+        
+        Reading starts at the offset instead of the beginning of the file, so the
+        cost depends on the number of new rows. An incomplete last line is left
+        for the next call.
+        
+        Args:
+            filename (str): Name of the CSV file in the raw directory
+            offset (int): Byte offset returned by the previous call (0 reads the whole file)
+            
+        Returns:
+            Tuple[pd.DataFrame, int]: New OHLCV rows with datetime index, and the offset
+                to pass next time
+        """
+        file_path = self.raw_dir / filename
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Data file not found: {file_path}")
+        
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            offset = max(offset, len(header))
+            
+            end = f.seek(0, 2)
+            if offset > end:
+                raise ValueError(f"Data file is shorter than the last read offset, it was rewritten: {file_path}")
+            
+            # The offset must fall right after a line break written by the previous read
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                raise ValueError(f"Offset {offset} is not at the start of a line in {file_path}")
+            
+            body = f.read(end - offset)
+        
+        body = body[:body.rfind(b'\n') + 1]
+        df = pd.read_csv(io.BytesIO(header + body), dtype=self._price_dtypes())
         
+        return self.prepare_frame(df), offset + len(body)
+    
+    def iter_csv(self, filename: str, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Lazily load OHLCV data from a CSV file in chunks.
+        
+        The file must already be sorted by date, since chunks are returned as
+        they are read instead of being sorted together.
+        
+        Args:
+            filename (str): Name of the CSV file in the raw directory
+            chunksize (int): Number of rows per chunk
+            
+        Returns:
+            Iterator[pd.DataFrame]: Chunks of OHLCV data with datetime index
+        """
+        file_path = self.raw_dir / filename
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Data file not found: {file_path}")
+        
+        last_timestamp = None
+        with pd.read_csv(file_path, dtype=self._price_dtypes(), chunksize=chunksize) as reader:
+            for chunk in reader:
+                chunk = self.prepare_frame(chunk, sort=False)
+                if not chunk.index.is_monotonic_increasing or (
+                        last_timestamp is not None and chunk.index[0] < last_timestamp):
+                    raise ValueError(f"Data file is not sorted by date: {file_path}")
+                last_timestamp = chunk.index[-1]
+                yield chunk
+    
+    def prepare_frame(self, df: pd.DataFrame, sort: bool = True) -> pd.DataFrame:
+        """
+        Validate raw OHLCV data and convert it to the loader's format.
+        
+        Args:
+            df (pd.DataFrame): DataFrame with a Date column and OHLCV columns
+            sort (bool): Whether to sort the rows by date
+            
+        Returns:
+            pd.DataFrame: DataFrame containing OHLCV data with datetime index
+        """
         # Ensure required columns exist
         required_columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
         missing_columns = [col for col in required_columns if col not in df.columns]
@@ -47,9 +137,16 @@ class DataLoader:
         df.set_index('Date', inplace=True)
         
         # Sort by date
-        df.sort_index(inplace=True)
+        if sort:
+            df.sort_index(inplace=True)
         
-        return df
+        return apply_dtype_policy(df, self.dtype_policy)
+    
+    def _price_dtypes(self) -> Optional[Dict[str, str]]:
+        """Get the dtypes used to parse the price columns under the dtype policy."""
+        if self.dtype_policy.price is None:
+            return None
+        return {col: self.dtype_policy.price for col in ['Open', 'High', 'Low', 'Close']}
     
     def save_processed_data(self, df: pd.DataFrame, filename: str) -> None:
         """
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+@dataclass(frozen=True)
+class DtypePolicy:
+    """
+    Column dtypes used for market data, indicators and signals.
+
+    A dtype of None leaves the column at the type pandas infers. Portfolio
+    cash and equity accounting is always float64, whatever the policy.
+    """
+    name: str
+    price: Optional[str] = None
+    volume: Optional[str] = None
+    indicator: Optional[str] = None
+    signal: Optional[str] = None
+
+
+STANDARD_POLICY = DtypePolicy(name='standard')
+COMPACT_POLICY = DtypePolicy(name='compact', price='float32', volume='uint32',
+                             indicator='float32', signal='int8')
+
+DTYPE_POLICIES = {policy.name: policy for policy in (STANDARD_POLICY, COMPACT_POLICY)}
+
+
+def get_dtype_policy(policy: Union[str, DtypePolicy, None] = None) -> DtypePolicy:
+    """
+    Resolve a dtype policy from its name.
+
+    Args:
+        policy (Union[str, DtypePolicy, None]): Policy name, policy instance, or None for standard
+
+    Returns:
+        DtypePolicy: The resolved policy
+    """
+    if policy is None:
+        return STANDARD_POLICY
+    if isinstance(policy, DtypePolicy):
+        return policy
+    if policy not in DTYPE_POLICIES:
+        raise ValueError(f"Unknown dtype policy: {policy}. Available: {list(DTYPE_POLICIES)}")
+    return DTYPE_POLICIES[policy]
+
+
+def apply_dtype_policy(df: pd.DataFrame, policy: Union[str, DtypePolicy, None] = None) -> pd.DataFrame:
+    """
+    Cast the OHLCV columns of a DataFrame to the dtypes of a policy.
+
+    Volume is only narrowed when every value is a non-negative integer that
+    fits the target type; otherwise it is left unchanged.
+
+    Args:
+        df (pd.DataFrame): DataFrame with OHLCV columns
+        policy (Union[str, DtypePolicy, None]): Dtype policy to apply
+
+    Returns:
+        pd.DataFrame: DataFrame with the policy dtypes applied
+    """
+    policy = get_dtype_policy(policy)
+
+    if policy.price is not None:
+        columns = [col for col in PRICE_COLUMNS if col in df.columns]
+        df[columns] = df[columns].astype(policy.price)
+
+    if policy.volume is not None and 'Volume' in df.columns:
+        volume = df['Volume'].to_numpy()
+        limits = np.iinfo(policy.volume)
+        if (len(volume) == 0 or
+                (np.all(np.mod(volume, 1) == 0) and volume.min() >= limits.min
+                 and volume.max() <= limits.max)):
+            df['Volume'] = volume.astype(policy.volume)
+
+    return df
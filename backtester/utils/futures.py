@@ -0,0 +1,339 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.utils.data_loader import DataLoader
+from backtester.utils.trading_calendar import TradingCalendar
+
+MANIFEST_VERSION = 1
+ROLL_RULES = ['calendar', 'volume', 'open_interest']
+ADJUSTMENTS = ['ratio', 'difference', 'none']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+ROLL_COLUMNS = ['date', 'from_contract', 'to_contract', 'gap']
+
+# Futures month codes, e.g. ESH2024 or ESH24 for March 2024
+MONTH_CODES = {code: month for month, code in enumerate('FGHJKMNQUVXZ', start=1)}
+CONTRACT_PATTERN = re.compile(r'([FGHJKMNQUVXZ])(\d{4}|\d{2})$')
+
+
+class ContinuousContractBuilder:
+    def __init__(self, data_loader: DataLoader, root: str, contracts_dir: Union[str, Path, None] = None,
+                 rule: str = 'volume', adjustment: str = 'ratio', roll_offset: int = 5):
+        """
+        Initialize a builder that stitches futures contracts into one back-adjusted series.
+
+        Each contract is one CSV in the loader format, optionally with an
+        'OpenInterest' column. Contracts are ordered by the month code at the
+        end of their file name (e.g. ESH2024.csv), or by their last date when
+        the name has none. The stitched series and its roll schedule are cached
+        under data/processed/continuous. A manifest of the contract files
+        tells when the cache is current. When new contracts sort after every
+        cached one, only the part of the series after the last cached roll is
+        rebuilt, and the earlier part is rescaled. Any other change to the
+        contract files rebuilds the whole series.
+
+        Args:
+            data_loader (DataLoader): Loader providing the directories and dtype policy
+            root (str): Name of the futures root, e.g. 'ES'
+            contracts_dir (Union[str, Path, None]): Directory of the contract files
+                (default: raw/<root>)
+            rule (str): Roll when the next contract's volume ('volume') or open interest
+                ('open_interest') first exceeds the front's, or roll_offset bars before
+                the front's last bar ('calendar')
+            adjustment (str): Back-adjust earlier contracts by the price 'ratio' or
+                'difference' at each roll, or leave prices unadjusted ('none')
+            roll_offset (int): Number of final bars of each contract skipped by the
+                'calendar' rule
+        """
+        if rule not in ROLL_RULES:
+            raise ValueError(f"Unknown roll rule: {rule}. Available: {ROLL_RULES}")
+        if adjustment not in ADJUSTMENTS:
+            raise ValueError(f"Unknown adjustment: {adjustment}. Available: {ADJUSTMENTS}")
+
+        self.data_loader = data_loader
+        self.root = root
+        self.contracts_dir = Path(contracts_dir) if contracts_dir is not None else data_loader.raw_dir / root
+        self.rule = rule
+        self.adjustment = adjustment
+        self.roll_offset = roll_offset
+
+        self.cache_dir = data_loader.processed_dir / 'continuous'
+        self.series_path = self.cache_dir / f"{root}.csv"
+        self.rolls_path = self.cache_dir / f"{root}_rolls.csv"
+        self.manifest_path = self.cache_dir / f"{root}_manifest.json"
+
+    def build(self, force: bool = False) -> pd.DataFrame:
+        """
+        Get the continuous series, rebuilding only what the contract files require.
+
+        Args:
+            force (bool): Rebuild the whole series even if the cache is current
+
+        Returns:
+            pd.DataFrame: Back-adjusted OHLCV data with datetime index and the
+                'Contract' each bar comes from
+        """
+        files = sorted(self.contracts_dir.glob('*.csv'))
+        if not files:
+            raise FileNotFoundError(f"No contract files found in {self.contracts_dir}")
+
+        manifest = None if force else self._read_manifest()
+        frames: Dict[str, pd.DataFrame] = {}
+        contracts = self._contract_entries(files, manifest, frames)
+        stable = self._stable_contracts(manifest, contracts)
+
+        if manifest is not None and stable == len(manifest['contracts']) == len(contracts):
+            return self.load()
+
+        # Only contracts added after every cached one leave the cached rolls valid;
+        # a changed, removed or earlier-sorting contract needs a full rebuild
+        if manifest is not None and 0 < stable == len(manifest['contracts']):
+            rolls = self.roll_schedule()
+            kept = len(rolls)
+        else:
+            kept = 0
+
+        if kept == 0:
+            series, new_rolls = self._stitch(self._load(contracts, frames))
+            series = self._adjust(series, new_rolls)
+        else:
+            series, new_rolls = self._rebuild_tail(contracts, frames, rolls, kept)
+
+        self._write(series, new_rolls, contracts)
+        return series
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load the cached continuous series.
+
+        Returns:
+            pd.DataFrame: Back-adjusted OHLCV data with datetime index and 'Contract' column
+        """
+        if not self.series_path.exists():
+            raise FileNotFoundError(f"Continuous series not built yet: {self.series_path}")
+        series = pd.read_csv(self.series_path)
+        series['Date'] = self._nanoseconds(pd.to_datetime(series['Date']))
+        return series.set_index('Date')
+
+    def roll_schedule(self) -> pd.DataFrame:
+        """
+        Load the cached roll schedule.
+
+        Returns:
+            pd.DataFrame: One row per roll with its date, the contracts rolled from and
+                to, and the price gap (ratio or difference) used for back-adjustment
+        """
+        if not self.rolls_path.exists():
+            raise FileNotFoundError(f"Roll schedule not built yet: {self.rolls_path}")
+        rolls = pd.read_csv(self.rolls_path)
+        rolls['date'] = self._nanoseconds(pd.to_datetime(rolls['date']))
+        return rolls
+
+    @staticmethod
+    def _nanoseconds(dates: pd.Series) -> pd.Series:
+        """Give parsed dates the nanosecond unit of freshly built series."""
+        return dates if dates.dt.tz is not None else dates.astype('datetime64[ns]')
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        """Get the manifest of the cache if it was built with the current settings."""
+        if not (self.manifest_path.exists() and self.series_path.exists() and self.rolls_path.exists()):
+            return None
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        settings = {'version': MANIFEST_VERSION, 'rule': self.rule,
+                    'adjustment': self.adjustment, 'roll_offset': self.roll_offset}
+        if any(manifest.get(key) != value for key, value in settings.items()):
+            return None
+        return manifest
+
+    @staticmethod
+    def _stable_contracts(manifest: Optional[Dict[str, Any]], contracts: List[Dict[str, Any]]) -> int:
+        """Count the leading contracts, in roll order, that match the cached ones and are unchanged."""
+        if manifest is None:
+            return 0
+        stable = 0
+        for cached, current in zip(manifest['contracts'], contracts):
+            if any(cached[key] != current[key] for key in ('file', 'size', 'mtime_ns')):
+                break
+            stable += 1
+        return stable
+
+    def _contract_entries(self, files: List[Path], manifest: Optional[Dict[str, Any]],
+                          frames: Dict[str, pd.DataFrame]) -> List[Dict[str, Any]]:
+        """Describe every contract file in roll order, loading only files not in the manifest."""
+        known = {entry['file']: entry for entry in manifest['contracts']} if manifest else {}
+        entries = []
+        for file in files:
+            stat = file.stat()
+            entry = known.get(file.name)
+            if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                match = CONTRACT_PATTERN.search(file.stem)
+                if match:
+                    year = int(match.group(2))
+                    key = [year + 2000 if year < 100 else year, MONTH_CODES[match.group(1)]]
+                else:
+                    frames[file.stem] = self._read(file)
+                    last = frames[file.stem].index[-1]
+                    key = [last.year, last.month]
+                entry = {'file': file.name, 'contract': file.stem, 'key': key,
+                         'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            entries.append(entry)
+        return sorted(entries, key=lambda entry: (entry['key'], entry['contract']))
+
+    def _read(self, file: Path) -> pd.DataFrame:
+        """Load one contract file in the loader's format."""
+        return self.data_loader.prepare_frame(pd.read_csv(file))
+
+    def _load(self, contracts: List[Dict[str, Any]], frames: Dict[str, pd.DataFrame]) -> List[Tuple[str, pd.DataFrame]]:
+        """Load contracts in order, reusing frames already loaded."""
+        loaded = []
+        for entry in contracts:
+            if entry['contract'] not in frames:
+                frames[entry['contract']] = self._read(self.contracts_dir / entry['file'])
+            loaded.append((entry['contract'], frames[entry['contract']]))
+        return loaded
+
+    def _stitch(self, frames: List[Tuple[str, pd.DataFrame]],
+                start: Optional[pd.Timestamp] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Find the rolls between consecutive contracts and gather the unadjusted series.
+
+        All contracts are aligned once on a master calendar, so each roll is a
+        vectorized search over two columns and the series is a single gather.
+        Roll dates and gaps only depend on the two contracts involved.
+        """
+        names = [name for name, _ in frames]
+        data = dict(frames)
+        calendar = TradingCalendar.from_data(data)
+        index = calendar.index
+        n_rows = len(index)
+
+        close = calendar.panel(data, 'Close', fill=False).to_numpy()
+        filled_close = calendar.panel(data, 'Close').to_numpy()
+        present = ~np.isnan(close)
+        measure = None
+        if self.rule != 'calendar':
+            column = 'Volume' if self.rule == 'volume' else 'OpenInterest'
+            if not all(column in frame.columns for frame in data.values()):
+                raise ValueError(f"The '{self.rule}' roll rule needs a {column} column in every contract")
+            measure = calendar.panel(data, column, fill=False).to_numpy()
+
+        start_row = 0 if start is None else int(np.searchsorted(index, start))
+        previous = start_row - 1
+        rolls = []
+        roll_rows = []
+
+        for k in range(len(names) - 1):
+            front_rows, next_rows = calendar.positions[names[k]], calendar.positions[names[k + 1]]
+            earliest = max(previous + 1, next_rows[0])
+            last_front = front_rows[-1]
+
+            if self.rule == 'calendar':
+                row = max(front_rows[max(len(front_rows) - self.roll_offset, 0)], earliest)
+            else:
+                with np.errstate(invalid='ignore'):
+                    hits = np.flatnonzero(measure[earliest:last_front + 1, k + 1] > measure[earliest:last_front + 1, k])
+                row = earliest + hits[0] if len(hits) else max(last_front + 1, earliest)
+            if row >= n_rows:
+                break
+
+            # Measure the gap on the last bar before the roll where both contracts traded
+            both = np.flatnonzero(present[next_rows[0]:row, k] & present[next_rows[0]:row, k + 1])
+            gap_row = next_rows[0] + both[-1] if len(both) else row
+            front_price, next_price = filled_close[gap_row, k], filled_close[gap_row, k + 1]
+            if self.adjustment == 'ratio':
+                gap = next_price / front_price
+            else:
+                gap = next_price - front_price
+            if not np.isfinite(gap) or (self.adjustment == 'ratio' and gap <= 0):
+                gap = 1.0 if self.adjustment == 'ratio' else 0.0
+
+            rolls.append((index[row], names[k], names[k + 1], float(gap)))
+            roll_rows.append(row)
+            previous = row
+
+        rows = np.arange(start_row, n_rows)
+        active = np.searchsorted(np.array(roll_rows, dtype=np.int64), rows, side='right')
+        keep = present[rows, active]
+        rows, active = rows[keep], active[keep]
+
+        columns = PRICE_COLUMNS + ['Volume']
+        if all('OpenInterest' in frame.columns for frame in data.values()):
+            columns.append('OpenInterest')
+        series = {}
+        for column in columns:
+            values = calendar.panel(data, column, fill=False).to_numpy()[rows, active]
+            if column not in PRICE_COLUMNS and np.all(np.mod(values, 1) == 0):
+                values = values.astype('int64')
+            series[column] = values
+        series['Contract'] = np.array(names, dtype=object)[active]
+
+        return (pd.DataFrame(series, index=index[rows].rename('Date')),
+                pd.DataFrame(rolls, columns=ROLL_COLUMNS))
+
+    def _adjust(self, series: pd.DataFrame, rolls: pd.DataFrame) -> pd.DataFrame:
+        """Back-adjust the prices before each roll by the gaps of all later rolls."""
+        if self.adjustment == 'none' or rolls.empty:
+            return series
+
+        gaps = rolls['gap'].to_numpy(dtype='float64')
+        segment = np.searchsorted(rolls['date'].to_numpy(), series.index.to_numpy(), side='right')
+        if self.adjustment == 'ratio':
+            after = np.append(np.cumprod(gaps[::-1])[::-1], 1.0)
+            for column in PRICE_COLUMNS:
+                series[column] = series[column].to_numpy() * after[segment]
+        else:
+            after = np.append(np.cumsum(gaps[::-1])[::-1], 0.0)
+            for column in PRICE_COLUMNS:
+                series[column] = series[column].to_numpy() + after[segment]
+        return series
+
+    def _rebuild_tail(self, contracts: List[Dict[str, Any]], frames: Dict[str, pd.DataFrame],
+                      rolls: pd.DataFrame, kept: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Restitch from the last cached roll on and rescale the cached series before it."""
+        last_roll = rolls.iloc[kept - 1]
+        names = [entry['contract'] for entry in contracts]
+        tail_contracts = contracts[names.index(last_roll['to_contract']):]
+
+        tail, tail_rolls = self._stitch(self._load(tail_contracts, frames), start=last_roll['date'])
+        tail = self._adjust(tail, tail_rolls)
+
+        cached = self.load()
+        prefix = cached[cached.index < last_roll['date']].copy()
+        old_gaps = rolls['gap'].to_numpy(dtype='float64')[kept:]
+        new_gaps = tail_rolls['gap'].to_numpy(dtype='float64')
+        if self.adjustment == 'ratio':
+            factor = np.prod(new_gaps) / np.prod(old_gaps)
+            for column in PRICE_COLUMNS:
+                prefix[column] = prefix[column] * factor
+        elif self.adjustment == 'difference':
+            shift = new_gaps.sum() - old_gaps.sum()
+            for column in PRICE_COLUMNS:
+                prefix[column] = prefix[column] + shift
+
+        series = pd.concat([prefix[tail.columns], tail])
+        all_rolls = pd.concat([rolls.iloc[:kept], tail_rolls], ignore_index=True)
+        return series, all_rolls
+
+    def _write(self, series: pd.DataFrame, rolls: pd.DataFrame, contracts: List[Dict[str, Any]]) -> None:
+        """Cache the series and schedule, replacing the manifest last."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        series.to_csv(self.series_path)
+        rolls.to_csv(self.rolls_path, index=False)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'rule': self.rule,
+            'adjustment': self.adjustment,
+            'roll_offset': self.roll_offset,
+            'contracts': contracts
+        }
+        temp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
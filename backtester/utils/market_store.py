@@ -0,0 +1,248 @@
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.utils.data_loader import DataLoader
+
+MANIFEST_VERSION = 1
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+HEADER = ('Date,' + ','.join(COLUMNS) + '\n').encode()
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+Timestamp = Union[str, pd.Timestamp, None]
+
+
+class MarketStore:
+    def __init__(self, data_loader: DataLoader, name: str = 'store', index_interval: int = 1000):
+        """
+        Initialize a partitioned store of OHLCV data for many symbols.
+
+        Data is kept as one CSV per symbol and year under data_dir/name, with a
+        JSON manifest giving each partition's date range, row count, size and the
+        byte offset of every index_interval-th row. Range queries use the manifest
+        to skip partitions outside the range and to read only the byte range
+        they need from the others.
+
+        Args:
+            data_loader (DataLoader): Loader whose data directory holds the store and
+                whose dtype policy is applied to loaded data
+            name (str): Name of the store directory
+            index_interval (int): Number of rows between byte offsets recorded in the
+                manifest (ignored for an existing store)
+        """
+        self.data_loader = data_loader
+        self.root = data_loader.data_dir / name
+        self.manifest_path = self.root / 'manifest.json'
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest.get('version') != MANIFEST_VERSION:
+                raise ValueError(f"Unsupported manifest version: {self.manifest.get('version')}")
+        else:
+            self.manifest = {'version': MANIFEST_VERSION, 'index_interval': index_interval, 'partitions': {}}
+        self.index_interval = self.manifest['index_interval']
+
+    def symbols(self) -> List[str]:
+        """
+        Get the symbols in the store.
+
+        Returns:
+            List[str]: Sorted symbol names
+        """
+        return sorted(self.manifest['partitions'])
+
+    def partitions(self, symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        Summarize the partitions of the store.
+
+        Args:
+            symbol (Optional[str]): Only list the partitions of this symbol
+
+        Returns:
+            pd.DataFrame: One row per partition with its date range, rows and bytes
+        """
+        symbols = self.symbols() if symbol is None else [symbol]
+        rows = [
+            {'symbol': name, 'year': int(year), 'start': pd.Timestamp(entry['start']),
+             'end': pd.Timestamp(entry['end']), 'rows': entry['rows'], 'bytes': entry['bytes']}
+            for name in symbols
+            for year, entry in self._sorted_partitions(name)
+        ]
+        return pd.DataFrame(rows, columns=['symbol', 'year', 'start', 'end', 'rows', 'bytes'])
+
+    def append(self, symbol: str, data: pd.DataFrame, save: bool = True) -> None:
+        """
+        Add OHLCV data for a symbol to the store.
+
+        Rows after the end of their year's partition are appended to it in place.
+        A partition is only rewritten when new rows fall inside its existing date
+        range, in which case they replace rows with the same timestamp. Other
+        partitions are left untouched.
+
+        Args:
+            symbol (str): Symbol of the data
+            data (pd.DataFrame): OHLCV data with datetime index, as returned by DataLoader
+            save (bool): Whether to save the manifest afterwards
+        """
+        missing_columns = [col for col in COLUMNS if col not in data.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        data = data[COLUMNS]
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        partitions = self.manifest['partitions'].setdefault(symbol, {})
+
+        for year, rows in data.groupby(data.index.year, sort=True):
+            key = str(year)
+            entry = partitions.get(key)
+            if entry is not None and rows.index[0] <= pd.Timestamp(entry['end']):
+                rows = pd.concat([self._read_partition(entry), rows])
+                rows = rows[~rows.index.duplicated(keep='last')].sort_index()
+                entry = None
+            partitions[key] = self._write_partition(symbol, key, rows, entry)
+
+        if save:
+            self.save_manifest()
+
+    def ingest(self, filename: str, symbol: Optional[str] = None, chunksize: int = 100000) -> None:
+        """
+        Copy a flat CSV file from the loader's raw directory into the store.
+
+        Args:
+            filename (str): Name of the CSV file in the raw directory
+            symbol (Optional[str]): Symbol of the data (default: the file name without extension)
+            chunksize (int): Number of rows read at a time
+        """
+        symbol = symbol or Path(filename).stem
+        for chunk in self.data_loader.iter_csv(filename, chunksize=chunksize):
+            self.append(symbol, chunk, save=False)
+        self.save_manifest()
+
+    def load(self, symbols: Optional[List[str]] = None, start: Timestamp = None,
+             end: Timestamp = None) -> Dict[str, pd.DataFrame]:
+        """
+        Load OHLCV data for several symbols over a date range.
+
+        Args:
+            symbols (Optional[List[str]]): Symbols to load (default: all symbols)
+            start (Timestamp): First timestamp to include (default: no lower bound)
+            end (Timestamp): Last timestamp to include (default: no upper bound)
+
+        Returns:
+            Dict[str, pd.DataFrame]: OHLCV data with datetime index by symbol
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        results = {}
+        for symbol in self.symbols() if symbols is None else symbols:
+            if symbol not in self.manifest['partitions']:
+                raise ValueError(f"Unknown symbol: {symbol}")
+
+            frames = [
+                self._read_partition(entry, start, end)
+                for _, entry in self._sorted_partitions(symbol)
+                if (start is None or pd.Timestamp(entry['end']) >= start)
+                and (end is None or pd.Timestamp(entry['start']) <= end)
+            ]
+            results[symbol] = pd.concat(frames) if frames else self._parse(b'')
+
+        return results
+
+    def load_symbol(self, symbol: str, start: Timestamp = None, end: Timestamp = None) -> pd.DataFrame:
+        """
+        Load OHLCV data for one symbol over a date range.
+
+        Args:
+            symbol (str): Symbol to load
+            start (Timestamp): First timestamp to include (default: no lower bound)
+            end (Timestamp): Last timestamp to include (default: no upper bound)
+
+        Returns:
+            pd.DataFrame: OHLCV data with datetime index
+        """
+        return self.load([symbol], start, end)[symbol]
+
+    def save_manifest(self) -> None:
+        """Atomically replace the manifest file with the in-memory manifest."""
+        temp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def _sorted_partitions(self, symbol: str) -> List:
+        """Get the (year, entry) pairs of a symbol in date order."""
+        return sorted(self.manifest['partitions'].get(symbol, {}).items(), key=lambda item: int(item[0]))
+
+    def _read_partition(self, entry: Dict[str, Any], start: Optional[pd.Timestamp] = None,
+                        end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Read the rows of a partition between two timestamps, seeking via the row index."""
+        times = np.asarray(entry['index_times'], dtype='int64')
+        offsets = entry['index_offsets']
+
+        first, last = len(HEADER), entry['bytes']
+        if start is not None:
+            position = np.searchsorted(times, start.value, side='right') - 1
+            if position >= 0:
+                first = offsets[position]
+        if end is not None:
+            position = np.searchsorted(times, end.value, side='right')
+            if position < len(times):
+                last = offsets[position]
+
+        with open(self.root / entry['file'], 'rb') as f:
+            f.seek(first)
+            body = f.read(last - first)
+
+        return self._parse(body).loc[start:end]
+
+    def _parse(self, body: bytes) -> pd.DataFrame:
+        """Parse partition rows into the loader's format."""
+        dtypes = {col: 'float64' for col in COLUMNS[:4]}
+        if not body:
+            dtypes['Volume'] = 'int64'
+        return self.data_loader.prepare_frame(pd.read_csv(io.BytesIO(HEADER + body), dtype=dtypes), sort=False)
+
+    def _write_partition(self, symbol: str, key: str, rows: pd.DataFrame,
+                         entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Append rows to a partition, or write it anew when entry is None."""
+        body = rows.to_csv(header=False, date_format=DATE_FORMAT, lineterminator='\n').encode()
+        line_breaks = np.flatnonzero(np.frombuffer(body, dtype=np.uint8) == ord('\n'))
+        line_starts = np.concatenate([[0], line_breaks[:-1] + 1])
+
+        path = self.root / symbol / f"{key}.csv"
+        if entry is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix('.csv.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(HEADER + body)
+            os.replace(temp_path, path)
+            entry = {
+                'file': f"{symbol}/{key}.csv",
+                'start': str(rows.index[0]),
+                'rows': 0,
+                'bytes': len(HEADER),
+                'index_times': [],
+                'index_offsets': []
+            }
+        else:
+            # Drop anything written after the size recorded in the manifest, e.g. by an interrupted append
+            with open(path, 'r+b') as f:
+                f.truncate(entry['bytes'])
+                f.seek(entry['bytes'])
+                f.write(body)
+
+        marks = np.arange((-entry['rows']) % self.index_interval, len(rows), self.index_interval)
+        entry['index_times'] += rows.index[marks].values.astype('datetime64[ns]').view('int64').tolist()
+        entry['index_offsets'] += (entry['bytes'] + line_starts[marks]).tolist()
+        entry['end'] = str(rows.index[-1])
+        entry['rows'] += len(rows)
+        entry['bytes'] += len(body)
+        return entry
@@ -0,0 +1,350 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from backtester.utils.config import StrategyConfig
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    symbol TEXT,
+    parameters TEXT NOT NULL,
+    data_fingerprint TEXT,
+    elapsed REAL,
+    equity_path TEXT,
+    trades_path TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy, symbol);
+CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs (data_fingerprint);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_name_value ON metrics (name, value);
+
+CREATE TABLE IF NOT EXISTS params (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS params_name_value ON params (name, value);
+"""
+
+RUN_FIELDS = ['strategy', 'symbol', 'parameters', 'data_fingerprint', 'elapsed', 'equity_path', 'trades_path']
+
+
+def fingerprint_data(data: pd.DataFrame) -> str:
+    """
+    Compute a fingerprint identifying a dataset.
+
+    Args:
+        data (pd.DataFrame): Data with datetime index
+
+    Returns:
+        str: Hex digest of the index and values
+    """
+    hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    digest = hashlib.sha1(hashes.tobytes())
+    digest.update(','.join(map(str, data.columns)).encode())
+    return digest.hexdigest()
+
+
+class ResultsStore:
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        """
+        Initialize a SQLite database of backtest runs and their metrics.
+
+        Runs, metrics and parameters live in separate tables indexed by name
+        and value, so top-N and filtered queries read only the matching index
+        entries. The database uses write-ahead logging, so any number of worker
+        processes can insert batches while others query it. Each process opens
+        its own connection on first use.
+
+        Args:
+            path (Union[str, Path]): Path of the database file
+            timeout (float): Seconds to wait for another writer before failing
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection.executescript(SCHEMA)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections cannot be sent to worker processes; each opens its own
+        return {'path': self.path, 'timeout': self.timeout, '_connection': None, '_pid': None}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the connection of the current process, opening it if needed."""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._connection.execute('PRAGMA analysis_limit=1000')
+            self._pid = os.getpid()
+        return self._connection
+
+    def add_run(self, strategy: Union[str, StrategyConfig], parameters: Optional[Dict[str, Any]] = None,
+                metrics: Optional[Dict[str, Any]] = None, **fields) -> int:
+        """
+        Record one run.
+
+        Args:
+            strategy (Union[str, StrategyConfig]): Strategy name, or a configuration providing
+                the strategy name, parameters and symbol
+            parameters (Optional[Dict[str, Any]]): Strategy parameters (default: from the configuration)
+            metrics (Optional[Dict[str, Any]]): Metrics, e.g. from generate_performance_report
+            **fields: Optional 'symbol', 'data_fingerprint', 'elapsed', 'equity_path' and 'trades_path'
+
+        Returns:
+            int: ID of the new run
+        """
+        return self.add_runs([{'strategy': strategy, 'parameters': parameters, 'metrics': metrics, **fields}])[0]
+
+    def add_runs(self, runs: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Record a batch of runs in a single transaction.
+
+        Args:
+            runs (Iterable[Dict[str, Any]]): Runs with the arguments of add_run as keys
+
+        Returns:
+            List[int]: IDs of the new runs, in order
+        """
+        records = [self._normalize(run) for run in runs]
+        if not records:
+            return []
+
+        created_at = datetime.now().isoformat(timespec='seconds')
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            first_id = connection.execute('SELECT COALESCE(MAX(run_id), 0) + 1 FROM runs').fetchone()[0]
+            run_ids = list(range(first_id, first_id + len(records)))
+
+            connection.executemany(
+                f"INSERT INTO runs (run_id, {', '.join(RUN_FIELDS)}, created_at) "
+                f"VALUES ({', '.join('?' * (len(RUN_FIELDS) + 2))})",
+                [(run_id, *(record[field] for field in RUN_FIELDS), created_at)
+                 for run_id, record in zip(run_ids, records)]
+            )
+            connection.executemany(
+                'INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)',
+                [(run_id, name, value)
+                 for run_id, record in zip(run_ids, records)
+                 for name, value in record['metrics'].items()]
+            )
+            connection.executemany(
+                'INSERT INTO params (run_id, name, value) VALUES (?, ?, ?)',
+                [(run_id, name, value)
+                 for run_id, record in zip(run_ids, records)
+                 for name, value in record['param_values'].items()]
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        # Keep the planner statistics current so filtered queries start from the most selective index
+        connection.execute('PRAGMA optimize')
+
+        return run_ids
+
+    def top(self, metric: str, n: int = 20, ascending: bool = False,
+            strategy: Optional[str] = None, symbol: Optional[str] = None,
+            parameters: Optional[Dict[str, Any]] = None,
+            metric_ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None) -> pd.DataFrame:
+        """
+        Get the best runs by a metric, optionally filtered.
+
+        Args:
+            metric (str): Metric to rank by, e.g. 'Sharpe Ratio'
+            n (int): Number of runs to return
+            ascending (bool): Rank the lowest values first (e.g. for 'Max Drawdown' magnitudes)
+            strategy (Optional[str]): Only include runs of this strategy
+            symbol (Optional[str]): Only include runs on this symbol
+            parameters (Optional[Dict[str, Any]]): Only include runs with these parameter values
+            metric_ranges (Optional[Dict[str, Tuple]]): Only include runs whose metrics fall in
+                these (low, high) ranges, with None for an open bound
+
+        Returns:
+            pd.DataFrame: Run details, parameters and all metrics of the selected runs,
+                indexed by run ID and ordered by the ranking metric
+        """
+        conditions = ['m.name = ?', 'm.value IS NOT NULL']
+        arguments: List[Any] = [metric]
+
+        if strategy is not None:
+            conditions.append('r.strategy = ?')
+            arguments.append(strategy)
+        if symbol is not None:
+            conditions.append('r.symbol = ?')
+            arguments.append(symbol)
+        for name, value in (parameters or {}).items():
+            conditions.append('m.run_id IN (SELECT run_id FROM params WHERE name = ? AND value = ?)')
+            arguments.extend([name, self._param_value(value)])
+        for name, (low, high) in (metric_ranges or {}).items():
+            bounds = ['name = ?']
+            arguments.append(name)
+            if low is not None:
+                bounds.append('value >= ?')
+                arguments.append(low)
+            if high is not None:
+                bounds.append('value <= ?')
+                arguments.append(high)
+            conditions.append(f"m.run_id IN (SELECT run_id FROM metrics WHERE {' AND '.join(bounds)})")
+
+        query = (
+            'SELECT r.run_id, r.strategy, r.symbol, r.parameters, r.data_fingerprint, r.elapsed, '
+            'r.equity_path, r.trades_path, r.created_at '
+            'FROM metrics m JOIN runs r ON r.run_id = m.run_id '
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY m.value {'ASC' if ascending else 'DESC'} LIMIT ?"
+        )
+        runs = pd.read_sql_query(query, self.connection, params=arguments + [n], index_col='run_id')
+        if runs.empty:
+            return runs
+
+        runs['parameters'] = runs['parameters'].map(json.loads)
+        placeholders = ', '.join('?' * len(runs))
+        metrics = pd.read_sql_query(
+            f"SELECT run_id, name, value FROM metrics WHERE run_id IN ({placeholders})",
+            self.connection, params=runs.index.tolist()
+        ).pivot(index='run_id', columns='name', values='value')
+
+        return runs.join(metrics)
+
+    def get_run(self, run_id: int) -> Dict[str, Any]:
+        """
+        Get the details, parameters and metrics of a run.
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            Dict[str, Any]: Run record with 'parameters' and 'metrics' dicts
+        """
+        cursor = self.connection.execute(f"SELECT {', '.join(RUN_FIELDS)}, created_at FROM runs WHERE run_id = ?",
+                                         (run_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Unknown run: {run_id}")
+
+        run = dict(zip(RUN_FIELDS + ['created_at'], row))
+        run['run_id'] = run_id
+        run['parameters'] = json.loads(run['parameters'])
+        run['metrics'] = dict(self.connection.execute(
+            'SELECT name, value FROM metrics WHERE run_id = ?', (run_id,)).fetchall())
+        return run
+
+    def load_equity_curve(self, run_id: int) -> pd.DataFrame:
+        """
+        Load the equity curve file linked to a run.
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            pd.DataFrame: Equity curve
+        """
+        return self._load_linked(run_id, 'equity_path')
+
+    def load_trade_history(self, run_id: int) -> pd.DataFrame:
+        """
+        Load the trade history file linked to a run.
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            pd.DataFrame: Trade history
+        """
+        return self._load_linked(run_id, 'trades_path')
+
+    def count(self) -> int:
+        """
+        Get the number of recorded runs.
+
+        Returns:
+            int: Number of runs
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the connection of the current process."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _load_linked(self, run_id: int, field: str) -> pd.DataFrame:
+        """Load a CSV file linked to a run."""
+        path = self.get_run(run_id)[field]
+        if path is None:
+            raise ValueError(f"Run {run_id} has no linked {field.replace('_path', '')} file")
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Linked file not found: {path}")
+        return pd.read_csv(path, index_col=0)
+
+    def _normalize(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a run to the values stored in the database."""
+        run = dict(run)
+        strategy = run.get('strategy')
+        if isinstance(strategy, StrategyConfig):
+            strategy_config = strategy.get_strategy_config()
+            run['strategy'] = strategy_config.get('name')
+            if run.get('parameters') is None:
+                run['parameters'] = strategy_config.get('parameters', {})
+            if run.get('symbol') is None:
+                run['symbol'] = strategy.get_data_config().get('symbol')
+        if not run.get('strategy'):
+            raise ValueError("Run has no strategy name")
+
+        parameters = {name: self._plain(value) for name, value in (run.get('parameters') or {}).items()}
+        run['parameters'] = json.dumps(parameters, sort_keys=True)
+        run['param_values'] = {name: self._param_value(value) for name, value in parameters.items()}
+
+        metrics = {}
+        for name, value in (run.get('metrics') or {}).items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            metrics[name] = value if math.isfinite(value) else None
+        run['metrics'] = metrics
+
+        for field in ['equity_path', 'trades_path']:
+            if run.get(field) is not None:
+                run[field] = str(run[field])
+        for field in RUN_FIELDS:
+            run.setdefault(field, None)
+        return run
+
+    @staticmethod
+    def _plain(value: Any) -> Any:
+        """Convert NumPy scalars to Python values."""
+        return value.item() if hasattr(value, 'item') else value
+
+    @staticmethod
+    def _param_value(value: Any) -> Any:
+        """Convert a parameter to a value SQLite can store and compare."""
+        value = ResultsStore._plain(value)
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return value
+        return json.dumps(value, sort_keys=True)
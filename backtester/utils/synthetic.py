@@ -0,0 +1,351 @@
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.utils.data_loader import DataLoader
+from backtester.utils.dtypes import DtypePolicy, apply_dtype_policy
+
+MODELS = ['gbm', 'regime', 'jump']
+
+
+class SyntheticMarket:
+    def __init__(self, symbols: Union[int, List[str]] = 1, model: str = 'gbm', seed: int = 0,
+                 mu: float = 0.0, sigma: float = 0.2, correlation: Union[float, np.ndarray] = 0.0,
+                 regimes: Sequence[Tuple[float, float]] = ((0.10, 0.15), (-0.20, 0.40)),
+                 regime_durations: Sequence[float] = (250.0, 60.0),
+                 jump_intensity: float = 5.0, jump_mean: float = -0.02, jump_std: float = 0.05,
+                 start: str = '2000-01-03', freq: str = 'B', periods_per_year: Optional[float] = None,
+                 initial_price: float = 100.0, base_volume: float = 1000000.0,
+                 block_size: Optional[int] = None,
+                 dtype_policy: Union[str, DtypePolicy, None] = None):
+        """
+        Initialize a seeded generator of synthetic OHLCV bars.
+
+        Bars are generated in fixed-size blocks. Each block draws from its own
+        random stream, derived from the seed and the block number, so the output
+        is the same whatever chunk size it is read in. Only one block is held
+        in memory at a time.
+
+        Log prices follow a random walk, so a series stays within the float64
+        range while |mu - sigma^2 / 2| * years and sigma * sqrt(years) are well
+        below 700. With the default zero drift, that holds for any series whose
+        timestamps pandas can represent. A block whose prices leave that range
+        raises a ValueError rather than producing inf or zero.
+
+        Timestamps are in nanoseconds, so the last bar must fall before
+        2262-04-11. From the default start, that allows about 137 million
+        minute bars or 68,000 business days per symbol. Larger datasets come
+        from more symbols.
+
+        Args:
+            symbols (Union[int, List[str]]): Symbol names, or a number of symbols to name SYN0000, ...
+            model (str): 'gbm' (geometric Brownian motion), 'regime' (Markov switching between
+                the (mu, sigma) pairs of regimes) or 'jump' (GBM with Merton log-normal jumps)
+            seed (int): Random seed
+            mu (float): Annual drift for 'gbm' and 'jump'
+            sigma (float): Annual volatility for 'gbm' and 'jump'
+            correlation (Union[float, np.ndarray]): Pairwise correlation of returns, or a full
+                correlation matrix
+            regimes (Sequence[Tuple[float, float]]): Annual (mu, sigma) of each regime
+            regime_durations (Sequence[float]): Expected length of each regime in bars
+            jump_intensity (float): Expected number of jumps per year
+            jump_mean (float): Mean log size of a jump
+            jump_std (float): Standard deviation of the log size of a jump
+            start (str): Timestamp of the first bar
+            freq (str): Bar frequency as a pandas offset alias (e.g. 'B', 'h', 'min')
+            periods_per_year (Optional[float]): Number of bars in a year, used to scale mu and
+                sigma (default: derived from freq, 252 for business days and calendar time
+                for fixed-length bars, e.g. 525,960 for 'min')
+            initial_price (float): Price before the first bar
+            base_volume (float): Typical volume per bar
+            block_size (Optional[int]): Bars per generation block (default: about one million
+                values per block across all symbols)
+            dtype_policy (Union[str, DtypePolicy, None]): Column dtypes of the generated frames
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model}. Available: {MODELS}")
+
+        self.symbols = [f"SYN{i:04d}" for i in range(symbols)] if isinstance(symbols, int) else list(symbols)
+        n = len(self.symbols)
+        if n == 0:
+            raise ValueError("At least one symbol is required")
+
+        self.model = model
+        self.seed = seed
+        self.mu = mu
+        self.sigma = sigma
+        self.regimes = [tuple(regime) for regime in regimes]
+        self.regime_durations = list(regime_durations)
+        if len(self.regimes) != len(self.regime_durations):
+            raise ValueError("regimes and regime_durations must have the same length")
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.freq = pd.tseries.frequencies.to_offset(freq)
+        self.start = pd.date_range(start=start, periods=1, freq=self.freq)[0]
+        self.periods_per_year = periods_per_year or self._periods_per_year(self.freq)
+        self.initial_price = initial_price
+        self.base_volume = base_volume
+        self.block_size = block_size or max(256, (1 << 20) // n)
+        self.dtype_policy = dtype_policy
+
+        if np.isscalar(correlation):
+            matrix = np.full((n, n), float(correlation))
+            np.fill_diagonal(matrix, 1.0)
+        else:
+            matrix = np.asarray(correlation, dtype='float64')
+            if matrix.shape != (n, n):
+                raise ValueError(f"Correlation matrix must be {n}x{n}")
+        self.cholesky = np.linalg.cholesky(matrix)
+
+    def iter_chunks(self, n_bars: int, chunk_size: int = 100000) -> Iterator[Dict[str, pd.DataFrame]]:
+        """
+        Stream bars for every symbol in chunks.
+
+        Args:
+            n_bars (int): Total number of bars per symbol
+            chunk_size (int): Number of bars per chunk
+
+        Returns:
+            Iterator[Dict[str, pd.DataFrame]]: OHLCV chunks by symbol, in the DataLoader format
+        """
+        for offset, arrays in self._rechunk(n_bars, chunk_size):
+            index = self._dates(offset, len(arrays['Close']))
+            yield {
+                symbol: self._frame(index, arrays, column)
+                for column, symbol in enumerate(self.symbols)
+            }
+
+    def iter_symbol(self, symbol: Optional[str] = None, n_bars: int = 1000,
+                    chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Stream bars for one symbol in chunks, e.g. as a BarStream source.
+
+        Args:
+            symbol (Optional[str]): Symbol to stream (default: the first symbol)
+            n_bars (int): Total number of bars
+            chunk_size (int): Number of bars per chunk
+
+        Returns:
+            Iterator[pd.DataFrame]: OHLCV chunks in the DataLoader format
+        """
+        column = self._column(symbol)
+        for offset, arrays in self._rechunk(n_bars, chunk_size):
+            yield self._frame(self._dates(offset, len(arrays['Close'])), arrays, column)
+
+    def generate(self, n_bars: int, symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        Generate bars for one symbol in memory, e.g. as Backtest data.
+
+        Args:
+            n_bars (int): Number of bars
+            symbol (Optional[str]): Symbol to generate (default: the first symbol)
+
+        Returns:
+            pd.DataFrame: OHLCV data in the DataLoader format
+        """
+        chunks = list(self.iter_symbol(symbol, n_bars, chunk_size=max(n_bars, 1)))
+        return chunks[0] if chunks else self._frame(self._dates(0, 0), self._empty(), 0)
+
+    def write_csv(self, data_loader: DataLoader, n_bars: int, chunk_size: int = 100000) -> List[Path]:
+        """
+        Write every symbol to the loader's raw directory, one CSV per symbol.
+
+        Args:
+            data_loader (DataLoader): Loader whose raw directory receives the files
+            n_bars (int): Number of bars per symbol
+            chunk_size (int): Number of bars written at a time
+
+        Returns:
+            List[Path]: Paths of the written files
+        """
+        paths = [data_loader.raw_dir / f"{symbol}.csv" for symbol in self.symbols]
+        for first, chunk in enumerate(self.iter_chunks(n_bars, chunk_size)):
+            for path, symbol in zip(paths, self.symbols):
+                chunk[symbol].to_csv(path, mode='w' if first == 0 else 'a', header=first == 0)
+        return paths
+
+    @staticmethod
+    def _periods_per_year(freq: pd.DateOffset) -> float:
+        """Number of bars of a frequency in a year."""
+        if isinstance(freq, (pd.offsets.BusinessDay, pd.offsets.CustomBusinessDay)):
+            return 252.0 / freq.n
+        if isinstance(freq, pd.offsets.Day):
+            return 365.25 / freq.n
+        if isinstance(freq, pd.offsets.Tick):
+            return 365.25 * 86400e9 / freq.nanos
+        reference = pd.Timestamp('2001-01-01')
+        return float(len(pd.date_range(reference, reference + pd.DateOffset(years=1), freq=freq, inclusive='left')))
+
+    def _column(self, symbol: Optional[str]) -> int:
+        """Get the column of a symbol in the generated arrays."""
+        if symbol is None:
+            return 0
+        if symbol not in self.symbols:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return self.symbols.index(symbol)
+
+    def _check_range(self, n_bars: int) -> None:
+        """Make sure the last of n_bars bars has a timestamp pandas can represent in nanoseconds."""
+        if n_bars <= 0:
+            return
+        try:
+            last = (self.start + (n_bars - 1) * self.freq).to_datetime64()
+        except (OverflowError, ValueError):
+            last = None
+        # Compare in microseconds: casting a later date to nanoseconds would overflow
+        limit = pd.Timestamp.max.to_datetime64().astype('datetime64[us]')
+        if last is None or last.astype('datetime64[us]') > limit:
+            raise ValueError(f"{n_bars} bars of frequency {self.freq.freqstr} from {self.start} end after "
+                             f"{pd.Timestamp.max}; generate fewer bars, start earlier or add symbols")
+
+    def _dates(self, offset: int, length: int) -> pd.DatetimeIndex:
+        """Timestamps of the bars from a given bar number on."""
+        # pd.date_range builds business-day and other calendar offsets one
+        # timestamp at a time, so the common frequencies use array arithmetic
+        steps = np.arange(offset, offset + length, dtype='int64')
+        freq, tz = self.freq, self.start.tz
+
+        if isinstance(freq, pd.offsets.Tick):
+            values = self.start.value + steps * freq.nanos
+            index = pd.DatetimeIndex(values.view('datetime64[ns]'), name='Date')
+            return index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
+
+        daily = (pd.offsets.Day, pd.offsets.BusinessDay, pd.offsets.CustomBusinessDay)
+        if tz is None and type(freq) in daily and not getattr(freq, 'offset', None):
+            day = self.start.normalize()
+            first = np.datetime64(day.date(), 'D')
+            if isinstance(freq, pd.offsets.Day):
+                dates = first + steps * freq.n
+            else:
+                dates = np.busday_offset(first, steps * freq.n, roll='forward',
+                                         weekmask=getattr(freq, 'weekmask', None) or '1111100',
+                                         holidays=list(getattr(freq, 'holidays', None) or ()))
+            values = dates.astype('datetime64[ns]').view('int64') + (self.start.value - day.value)
+            return pd.DatetimeIndex(values.view('datetime64[ns]'), name='Date')
+
+        first = self.start + offset * freq if offset else self.start
+        return pd.date_range(start=first, periods=length, freq=freq, name='Date')
+
+    def _frame(self, index: pd.DatetimeIndex, arrays: Dict[str, np.ndarray], column: int) -> pd.DataFrame:
+        """Build the DataFrame of one symbol from the generated arrays."""
+        df = pd.DataFrame({name: values[:, column] for name, values in arrays.items()}, index=index)
+        return apply_dtype_policy(df, self.dtype_policy)
+
+    def _empty(self) -> Dict[str, np.ndarray]:
+        """Generated arrays with no bars."""
+        n = len(self.symbols)
+        return {name: np.empty((0, n)) for name in ['Open', 'High', 'Low', 'Close']} | \
+            {'Volume': np.empty((0, n), dtype='int64')}
+
+    def _rechunk(self, n_bars: int, chunk_size: int) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Regroup the fixed-size generation blocks into chunks of the requested size."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self._check_range(n_bars)
+
+        # Blocks not yet fully handed out, and the first row of the oldest one still pending
+        pending: Deque[Dict[str, np.ndarray]] = deque()
+        position = 0
+        pending_rows = 0
+        offset = 0
+        for block in self._blocks(n_bars):
+            pending.append(block)
+            pending_rows += len(block['Close'])
+            while pending_rows >= chunk_size or (offset + pending_rows == n_bars and pending_rows):
+                take = min(chunk_size, pending_rows)
+                parts = []
+                needed = take
+                while needed:
+                    first = pending[0]
+                    rows = min(len(first['Close']) - position, needed)
+                    parts.append({name: values[position:position + rows] for name, values in first.items()})
+                    position += rows
+                    needed -= rows
+                    if position == len(first['Close']):
+                        pending.popleft()
+                        position = 0
+                if len(parts) == 1:
+                    chunk = parts[0]
+                else:
+                    chunk = {name: np.concatenate([part[name] for part in parts]) for name in block}
+                yield offset, chunk
+                offset += take
+                pending_rows -= take
+
+    def _blocks(self, n_bars: int) -> Iterator[Dict[str, np.ndarray]]:
+        """Generate the bars block by block, carrying prices and regime across blocks."""
+        n = len(self.symbols)
+        dt = 1.0 / self.periods_per_year
+        previous_close = np.full(n, float(self.initial_price))
+        regime_state = (0, None)  # current regime, bars left in it
+
+        for number, start in enumerate(range(0, n_bars, self.block_size)):
+            size = min(self.block_size, n_bars - start)
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(number,)))
+
+            shocks = rng.standard_normal((size, n)) @ self.cholesky.T
+
+            if self.model == 'regime':
+                regime, regime_state = self._regime_path(rng, size, regime_state)
+                mu = np.array([r[0] for r in self.regimes])[regime][:, None]
+                sigma = np.array([r[1] for r in self.regimes])[regime][:, None]
+            else:
+                mu, sigma = self.mu, self.sigma
+
+            log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+
+            if self.model == 'jump':
+                jumps = rng.poisson(self.jump_intensity * dt, (size, n))
+                log_returns += jumps * self.jump_mean + np.sqrt(jumps) * self.jump_std * rng.standard_normal((size, n))
+
+            with np.errstate(over='ignore', under='ignore'):
+                close = previous_close * np.exp(np.cumsum(log_returns, axis=0))
+            if not np.all(np.isfinite(close) & (close > 0)):
+                raise ValueError(f"Prices left the float64 range within {start + size} bars; "
+                                 f"lower mu and sigma or generate fewer bars")
+            prior = np.vstack([previous_close, close[:-1]])
+            previous_close = close[-1]
+
+            # Opens gap slightly from the prior close; highs and lows extend past the body
+            bar_sigma = np.broadcast_to(sigma * np.sqrt(dt), (size, n))
+            open_ = prior * np.exp(0.2 * bar_sigma * rng.standard_normal((size, n)))
+            high = np.maximum(open_, close) * np.exp(0.5 * bar_sigma * np.abs(rng.standard_normal((size, n))))
+            low = np.minimum(open_, close) * np.exp(-0.5 * bar_sigma * np.abs(rng.standard_normal((size, n))))
+
+            # Volume rises with the size of the move
+            activity = 1.0 + np.abs(log_returns) / bar_sigma
+            volume = self.base_volume * activity * np.exp(0.3 * rng.standard_normal((size, n)))
+
+            yield {
+                'Open': open_,
+                'High': high,
+                'Low': low,
+                'Close': close,
+                'Volume': np.round(volume).astype('int64')
+            }
+
+    def _regime_path(self, rng: np.random.Generator, size: int,
+                     state: Tuple[int, Optional[int]]) -> Tuple[np.ndarray, Tuple[int, Optional[int]]]:
+        """Draw the regime of each bar of a block, as runs of geometric length."""
+        regime, remaining = state
+        n_regimes = len(self.regimes)
+        if remaining is None:
+            remaining = rng.geometric(1.0 / self.regime_durations[regime])
+
+        runs, states = [], []
+        total = 0
+        while total < size:
+            run = min(remaining, size - total)
+            runs.append(run)
+            states.append(regime)
+            total += run
+            remaining -= run
+            if remaining == 0:
+                regime = (regime + 1) % n_regimes
+                remaining = rng.geometric(1.0 / self.regime_durations[regime])
+
+        return np.repeat(states, runs), (regime, remaining)
@@ -0,0 +1,235 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.utils.data_loader import DataLoader
+
+
+class TradingCalendar:
+    # Calendars already built in this process, by fingerprint of the symbols' indexes
+    _cache: Dict[str, 'TradingCalendar'] = {}
+
+    def __init__(self, index: pd.DatetimeIndex, positions: Dict[str, np.ndarray], fingerprint: str):
+        """
+        Initialize a master calendar from the positions of each symbol's bars in it.
+
+        Use from_data to build one. Each symbol is mapped once to integer row
+        numbers in the master index. Aligning a column of every symbol is then
+        a gather through those numbers instead of a pandas reindex per symbol.
+
+        Args:
+            index (pd.DatetimeIndex): Sorted union of every symbol's timestamps
+            positions (Dict[str, np.ndarray]): Row of each of a symbol's bars in the master index
+            fingerprint (str): Fingerprint of the indexes the calendar was built from
+        """
+        self.index = index
+        self.positions = positions
+        self.fingerprint = fingerprint
+        self.symbols = list(positions)
+        self._fill_positions: Dict[Tuple[str, Optional[int]], np.ndarray] = {}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, pd.DataFrame],
+                  data_loader: Optional[DataLoader] = None) -> 'TradingCalendar':
+        """
+        Build the calendar of a dataset, or reuse the one already built for it.
+
+        Calendars are cached in memory and, when a data loader is given, as
+        .npz files in its processed directory, keyed by a fingerprint of the
+        symbols and their timestamps.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): Data with datetime index by symbol
+            data_loader (Optional[DataLoader]): Loader whose processed directory holds the cache
+
+        Returns:
+            TradingCalendar: Calendar of the dataset
+        """
+        if not data:
+            raise ValueError("At least one symbol is required")
+
+        timestamps = {symbol: cls._timestamps(frame.index) for symbol, frame in data.items()}
+        for symbol, values in timestamps.items():
+            if len(values) > 1 and not (np.diff(values) > 0).all():
+                raise ValueError(f"Index of {symbol} is not sorted and unique")
+
+        digest = hashlib.sha1()
+        for symbol, values in timestamps.items():
+            digest.update(symbol.encode() + b'\0')
+            digest.update(values.tobytes())
+        fingerprint = digest.hexdigest()
+
+        if fingerprint in cls._cache:
+            return cls._cache[fingerprint]
+
+        tz = next(iter(data.values())).index.tz
+        cache_path = None
+        if data_loader is not None:
+            cache_path = data_loader.processed_dir / 'calendar' / f"{fingerprint}.npz"
+
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path, allow_pickle=False) as cached:
+                master = cached['index']
+                bounds = cached['offsets']
+                flat = cached['positions']
+                symbols = cached['symbols'].tolist()
+            positions = {symbol: flat[bounds[i]:bounds[i + 1]] for i, symbol in enumerate(symbols)}
+        else:
+            master = np.unique(np.concatenate(list(timestamps.values())))
+            positions = {symbol: np.searchsorted(master, values) for symbol, values in timestamps.items()}
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                lengths = [len(rows) for rows in positions.values()]
+                temp_path = cache_path.with_name(cache_path.stem + '.tmp.npz')
+                np.savez(temp_path, index=master, symbols=np.array(list(positions)),
+                         offsets=np.concatenate([[0], np.cumsum(lengths)]),
+                         positions=np.concatenate(list(positions.values())))
+                temp_path.replace(cache_path)
+
+        index = pd.DatetimeIndex(master.astype('datetime64[ns]'), name='Date')
+        if tz is not None:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        calendar = cls(index, positions, fingerprint)
+        cls._cache[fingerprint] = calendar
+        return calendar
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget the calendars built in this process."""
+        cls._cache.clear()
+
+    def present(self, symbol: str) -> np.ndarray:
+        """
+        Get the rows of the master index where a symbol has a bar.
+
+        Args:
+            symbol (str): Symbol to look up
+
+        Returns:
+            np.ndarray: Boolean mask over the master index
+        """
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[self._rows(symbol)] = True
+        return mask
+
+    def fill_positions(self, symbol: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Get, for each row of the master index, the symbol's bar to use when forward-filling.
+
+        Args:
+            symbol (str): Symbol to look up
+            limit (Optional[int]): Maximum number of master rows a bar is carried forward
+                (default: no limit)
+
+        Returns:
+            np.ndarray: Row number in the symbol's own data, -1 where no bar is available
+        """
+        key = (symbol, limit)
+        if key not in self._fill_positions:
+            rows = self._rows(symbol)
+            latest = np.full(len(self.index), -1, dtype=np.int64)
+            latest[rows] = np.arange(len(rows))
+            latest = np.maximum.accumulate(latest)
+
+            if limit is not None:
+                last_row = np.full(len(self.index), -1, dtype=np.int64)
+                last_row[rows] = rows
+                last_row = np.maximum.accumulate(last_row)
+                latest[np.arange(len(self.index)) - last_row > limit] = -1
+
+            self._fill_positions[key] = latest
+        return self._fill_positions[key]
+
+    def masks(self, symbols: Optional[List[str]] = None,
+              limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get which master rows of each symbol hold an actual bar or a forward-filled one.
+
+        Args:
+            symbols (Optional[List[str]]): Symbols of the columns (default: all symbols)
+            limit (Optional[int]): Maximum number of rows a bar is carried forward
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 'present' and 'filled' boolean arrays with one
+                row per master timestamp and one column per symbol
+        """
+        symbols = self.symbols if symbols is None else symbols
+        present = np.column_stack([self.present(symbol) for symbol in symbols])
+        available = np.column_stack([self.fill_positions(symbol, limit) >= 0 for symbol in symbols])
+        return present, available & ~present
+
+    def panel(self, data: Dict[str, pd.DataFrame], column: str = 'Close', fill: bool = True,
+              limit: Optional[int] = None, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Align one column of every symbol on the master index.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): The data the calendar was built from
+            column (str): Column to align
+            fill (bool): Forward-fill missing bars (otherwise they are NaN)
+            limit (Optional[int]): Maximum number of rows a bar is carried forward
+            symbols (Optional[List[str]]): Symbols of the columns (default: all symbols)
+
+        Returns:
+            pd.DataFrame: One row per master timestamp and one column per symbol
+        """
+        symbols = self.symbols if symbols is None else symbols
+        values = np.full((len(self.index), len(symbols)), np.nan)
+        for column_number, symbol in enumerate(symbols):
+            source = data[symbol][column].to_numpy(dtype='float64')
+            if len(source) != len(self._rows(symbol)):
+                raise ValueError(f"Data of {symbol} does not match the calendar")
+            if fill:
+                rows = self.fill_positions(symbol, limit)
+                available = rows >= 0
+                values[available, column_number] = source[rows[available]]
+            else:
+                values[self._rows(symbol), column_number] = source
+        return pd.DataFrame(values, index=self.index, columns=symbols)
+
+    def align(self, data: pd.DataFrame, symbol: str, fill: bool = True,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Align all columns of one symbol on the master index.
+
+        Args:
+            data (pd.DataFrame): Data of the symbol the calendar was built from
+            symbol (str): Symbol of the data
+            fill (bool): Forward-fill missing bars (otherwise they are NaN)
+            limit (Optional[int]): Maximum number of rows a bar is carried forward
+
+        Returns:
+            pd.DataFrame: The symbol's data with one row per master timestamp
+        """
+        if fill:
+            rows = self.fill_positions(symbol, limit)
+        else:
+            rows = np.full(len(self.index), -1, dtype=np.int64)
+            rows[self._rows(symbol)] = np.arange(len(self._rows(symbol)))
+        available = rows >= 0
+
+        aligned = {}
+        for name in data.columns:
+            source = data[name].to_numpy()
+            if source.dtype.kind in 'iub':
+                source = source.astype('float64')
+            values = np.full(len(self.index), np.nan, dtype=source.dtype if source.dtype.kind == 'f' else object)
+            values[available] = source[rows[available]]
+            aligned[name] = values
+        return pd.DataFrame(aligned, index=self.index)
+
+    @staticmethod
+    def _timestamps(index: pd.DatetimeIndex) -> np.ndarray:
+        """Get an index as nanoseconds since the epoch (UTC for aware indexes)."""
+        if not isinstance(index, pd.DatetimeIndex):
+            raise ValueError("Data must have a datetime index")
+        # Converting the underlying numpy array is cheap, and a no-op for nanosecond indexes
+        return index.values.astype('datetime64[ns]', copy=False).view('int64')
+
+    def _rows(self, symbol: str) -> np.ndarray:
+        """Get the master rows of a symbol's bars."""
+        if symbol not in self.positions:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return self.positions[symbol]